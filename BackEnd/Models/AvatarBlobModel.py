@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, func
+from database import Base
+
+class AvatarBlob(Base):
+    """A stored avatar image, keyed by the sha256 of its content and shared by every profile using it"""
+    __tablename__ = "avatar_blobs"
+    hash = Column(String, primary_key=True)
+    ext = Column(String, nullable=False)
+    size = Column(Integer, nullable=False)
+    variants = Column(JSON, nullable=True)  # {size: {format: path relative to uploads/avatars}}
+    refcount = Column(Integer, nullable=False, default=0, server_default="0")  # Profiles pointing at it
+    # When refcount last dropped to 0. The row is kept until the reclaimer's grace period has
+    # passed from here, so its files can't be removed while an upload is about to reuse them
+    released_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=func.now())
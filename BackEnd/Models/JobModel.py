@@ -1,9 +1,13 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Text, Boolean
+from sqlalchemy import Index, Column, Integer, String, ForeignKey, Text, Boolean
 from sqlalchemy.orm import relationship
 from database import Base
 
 class Job(Base):
     __tablename__ = "jobs"
+    __table_args__ = (
+        # List endpoints and eager loads filter by profile_id
+        Index("ix_jobs_profile_id", "profile_id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     profile_id = Column(String, ForeignKey("profiles.id"), nullable=False)
     title = Column(String, nullable=False)
@@ -1,6 +1,12 @@
-from sqlalchemy import Column, String, DateTime, func
+from sqlalchemy import Column, Integer, String, DateTime, JSON, func
 from sqlalchemy.orm import relationship
 from database import Base
+import secrets
+
+def initial_version() -> int:
+    """Random starting version, so a profile deleted and recreated under the same id
+    never repeats an ETag (or cursor version) the old one handed out"""
+    return secrets.randbits(48)
 
 class Profile(Base):
     __tablename__ = "profiles"
@@ -9,8 +15,12 @@ class Profile(Base):
     FirstName = Column(String)
     LastName = Column(String)
     avatar_url = Column(String, nullable=True)
+    avatar_variants = Column(JSON, nullable=True)  # {size: {format: url}} generated on upload
+    avatar_hash = Column(String, nullable=True)  # AvatarBlob.hash, None for external/legacy avatar URLs
     email = Column(String, nullable=True)
     phone = Column(String, nullable=True)
+    # Bumped on every write to the profile or its children; used for ETags
+    version = Column(Integer, nullable=False, default=initial_version, server_default="0")
     
     services = relationship("Service", back_populates="profile", cascade="all, delete-orphan")
     social_links = relationship("SocialLink", back_populates="profile", cascade="all, delete-orphan")
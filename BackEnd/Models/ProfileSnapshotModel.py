@@ -0,0 +1,10 @@
+from sqlalchemy import Column, Integer, String, DateTime, LargeBinary, func
+from database import Base
+
+class ProfileSnapshot(Base):
+    """Serialized ProfileResponse JSON, rebuilt whenever the profile or a child changes"""
+    __tablename__ = "profile_snapshots"
+    profile_id = Column(String, primary_key=True)
+    payload = Column(LargeBinary, nullable=False)
+    version = Column(Integer, nullable=False, default=0, server_default="0")  # Profile.version it was built from
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
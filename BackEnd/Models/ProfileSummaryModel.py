@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Index, func
+from database import Base
+
+class ProfileSummary(Base):
+    """Directory card for a profile, denormalized from the profile and its children on every write.
+
+    WITHOUT ROWID with (sort_name, profile_id) as the key: rows are stored in directory
+    order, so a page is one range scan of the table itself, with no per-row lookups.
+    """
+    __tablename__ = "profile_summary"
+    __table_args__ = (
+        # Writes find the row to replace by profile id
+        Index("ux_profile_summary_profile", "profile_id", unique=True),
+        {"sqlite_with_rowid": False},
+    )
+    sort_name = Column(String, primary_key=True)  # directory.sort_key("first last"); empty for unnamed profiles
+    profile_id = Column(String, primary_key=True)
+    FirstName = Column(String, nullable=True)
+    LastName = Column(String, nullable=True)
+    avatar_url = Column(String, nullable=True)  # Card-sized variant when one exists
+    top_services = Column(JSON, nullable=False, default=list)  # Titles of the first visible services
+    service_count = Column(Integer, nullable=False, default=0)
+    project_count = Column(Integer, nullable=False, default=0)
+    job_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
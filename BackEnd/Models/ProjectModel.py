@@ -1,9 +1,13 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Text, Boolean
+from sqlalchemy import Index, Column, Integer, String, ForeignKey, Text, Boolean
 from sqlalchemy.orm import relationship
 from database import Base
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        # List endpoints and eager loads filter by profile_id and order by sort_order
+        Index("ix_projects_profile_sort", "profile_id", "sort_order"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     profile_id = Column(String, ForeignKey("profiles.id"), nullable=False)
     title = Column(String, nullable=False)
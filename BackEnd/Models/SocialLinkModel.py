@@ -1,9 +1,13 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Boolean
+from sqlalchemy import Index, Column, Integer, String, ForeignKey, Boolean
 from sqlalchemy.orm import relationship
 from database import Base
 
 class SocialLink(Base):
     __tablename__ = "social_links"
+    __table_args__ = (
+        # List endpoints and eager loads filter by profile_id
+        Index("ix_social_links_profile_id", "profile_id"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     profile_id = Column(String, ForeignKey("profiles.id"), nullable=False)
     platform = Column(String, nullable=False)
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from typing import Optional, List
+
+class SortOrderUpdate(BaseModel):
+    id: int
+    sort_order: int
+
+class BulkItemResult(BaseModel):
+    op: str  # create / update / reorder / delete
+    index: int  # Position of the item in its request list
+    id: Optional[int] = None
+    status: str  # created / updated / deleted / not_found
+    
+class BulkResponse(BaseModel):
+    results: List[BulkItemResult]
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from typing import Optional, List
+
+class ProfileCard(BaseModel):
+    profile_id: str
+    FirstName: Optional[str] = None
+    LastName: Optional[str] = None
+    avatar_url: Optional[str] = None
+    top_services: List[str] = []  # Titles of the first few visible services
+    service_count: int
+    project_count: int
+    job_count: int
+
+    class Config:
+        from_attributes = True
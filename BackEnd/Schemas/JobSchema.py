@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
 
 class JobsBase(BaseModel):
     title: str
@@ -15,3 +15,11 @@ class JobsResponse(JobsBase):
     appear: bool
     class Config:
         from_attributes = True
+
+class JobsBulkUpdate(JobsCreate):
+    id: int
+
+class JobsBulkRequest(BaseModel):
+    create: List[JobsCreate] = []
+    update: List[JobsBulkUpdate] = []
+    delete: List[int] = []
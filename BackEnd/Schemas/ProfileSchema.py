@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime
 from Schemas.JobSchema import JobsResponse
 from Schemas.ServiceSchema import ServiceResponse
@@ -19,6 +19,7 @@ class ProfileCreate(ProfileBase):
 
 class ProfileResponse(ProfileBase):
     id: str
+    avatar_variants: Optional[Dict[str, Dict[str, str]]] = None  # e.g. {"64": {"webp": url, "jpg": url}}
     created_at: Optional[datetime] = None
     jobs: Optional[List[JobsResponse]] = []
     services: Optional[List[ServiceResponse]] = []
@@ -27,3 +28,10 @@ class ProfileResponse(ProfileBase):
     
     class Config:
         from_attributes = True
+
+class ProfileBatchRequest(BaseModel):
+    ids: List[str]
+
+class ProfileBatchResponse(BaseModel):
+    profiles: List[Optional[ProfileResponse]]  # In request order, null where the id wasn't found
+    missing: List[str]
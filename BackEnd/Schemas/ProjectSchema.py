@@ -1,5 +1,6 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
+from Schemas.BulkSchema import SortOrderUpdate
 
 
 class ProjectBase(BaseModel):
@@ -18,3 +19,12 @@ class ProjectResponse(ProjectBase):
     appear: bool
     class Config:
         from_attributes = True
+
+class ProjectBulkUpdate(ProjectCreate):
+    id: int
+
+class ProjectBulkRequest(BaseModel):
+    create: List[ProjectCreate] = []
+    update: List[ProjectBulkUpdate] = []
+    delete: List[int] = []
+    reorder: List[SortOrderUpdate] = []
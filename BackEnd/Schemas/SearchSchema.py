@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+from typing import Optional
+
+class SearchResult(BaseModel):
+    profile_id: str
+    FirstName: Optional[str] = None
+    LastName: Optional[str] = None
+    avatar_url: Optional[str] = None
+    score: float  # Higher is more relevant
+    snippet: str  # Best matching excerpt, matches wrapped in [ ]
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
+from Schemas.BulkSchema import SortOrderUpdate
 class ServiceBase(BaseModel):
     title: str
     description: Optional[str] = None
@@ -14,3 +15,12 @@ class ServiceResponse(ServiceBase):
     appear: bool
     class Config:
         from_attributes = True
+
+class ServiceBulkUpdate(ServiceCreate):
+    id: int
+
+class ServiceBulkRequest(BaseModel):
+    create: List[ServiceCreate] = []
+    update: List[ServiceBulkUpdate] = []
+    delete: List[int] = []
+    reorder: List[SortOrderUpdate] = []
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
 
 class SocialLinkBase(BaseModel):
     platform: str
@@ -14,3 +14,11 @@ class SocialLinkResponse(SocialLinkBase):
     appear: bool
     class Config:
         from_attributes = True
+
+class SocialLinkBulkUpdate(SocialLinkCreate):
+    id: int
+
+class SocialLinkBulkRequest(BaseModel):
+    create: List[SocialLinkCreate] = []
+    update: List[SocialLinkBulkUpdate] = []
+    delete: List[int] = []
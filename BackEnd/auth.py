@@ -1,27 +1,32 @@
 from fastapi import HTTPException, Request, Depends
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials, APIKeyCookie
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials, APIKeyCookie, APIKeyHeader
 from jose import jwt, JWTError
 from typing import Optional
-import httpx
-from config import AUTH0_DOMAIN, AUTH0_AUDIENCE, ALGORITHMS
-from database import SessionLocal
+import hmac
+from config import AUTH0_DOMAIN, AUTH0_AUDIENCE, ALGORITHMS, ADMIN_API_KEY
+from jwks import JWKSKeyStore
+from token_cache import VerifiedTokenCache
+from known_profiles import KnownProfiles
+from profile_events import profile_changed
 from Models.ProfileModel import Profile
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import AsyncWriteSessionLocal
 
 # Make security optional for Swagger
 security = HTTPBearer(auto_error=False)  # auto_error=False makes it optional
 cookie_security = APIKeyCookie(name="access_token", auto_error=False)
+admin_key_security = APIKeyHeader(name="X-Admin-Key", scheme_name="adminKey", auto_error=False)
 
-# Cache for JWKS
-_jwks_cache = None
+# Signing keys, started/stopped in the app lifespan
+jwks_store = JWKSKeyStore(f"https://{AUTH0_DOMAIN}/.well-known/jwks.json")
 
-def get_jwks():
-    global _jwks_cache
-    if _jwks_cache is None:
-        url = f"https://{AUTH0_DOMAIN}/.well-known/jwks.json"
-        response = httpx.get(url)
-        _jwks_cache = response.json()
-    return _jwks_cache
+# Claims of already-verified tokens, so warm sessions skip the RS256 check
+token_cache = VerifiedTokenCache()
+
+# User ids whose profile exists, for the /api/profile/me fast path
+known_profiles = KnownProfiles()
 
 def get_token_from_request(request: Request) -> Optional[str]:
     """Get token from HTTP-only cookie first, then from Authorization header as fallback"""
@@ -56,19 +61,13 @@ async def verify_token(request: Request = None, credentials: HTTPAuthorizationCr
     if len(token_parts) != 3:
         raise HTTPException(status_code=401, detail=f"Invalid token format. Expected 3 parts, got {len(token_parts)}")
     
+    cached_payload = token_cache.get(token)
+    if cached_payload is not None:
+        return cached_payload
+    
     try:
-        jwks = get_jwks()
         unverified_header = jwt.get_unverified_header(token)
-        rsa_key = {}
-        for key in jwks["keys"]:
-            if key["kid"] == unverified_header["kid"]:
-                rsa_key = {
-                    "kty": key["kty"],
-                    "kid": key["kid"],
-                    "use": key["use"],
-                    "n": key["n"],
-                    "e": key["e"]
-                }
+        rsa_key = await jwks_store.get_key(unverified_header.get("kid"))
         if not rsa_key:
             raise HTTPException(status_code=401, detail="Unable to find appropriate key")
         
@@ -79,6 +78,7 @@ async def verify_token(request: Request = None, credentials: HTTPAuthorizationCr
             audience=AUTH0_AUDIENCE,
             issuer=f"https://{AUTH0_DOMAIN}/"
         )
+        token_cache.set(token, payload)
         return payload
     except JWTError as e:
         # JWTError catches all JWT-related errors including decode errors
@@ -112,6 +112,13 @@ async def get_token_data(
     # Verify the token
     return await verify_token(request=request if token else None, credentials=HTTPAuthorizationCredentials(scheme="Bearer", credentials=token) if token else None)
 
+async def require_admin_key(admin_key: Optional[str] = Depends(admin_key_security)):
+    """Dependency for admin-only endpoints - 404 unless ADMIN_API_KEY is configured"""
+    if not ADMIN_API_KEY:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not admin_key or not hmac.compare_digest(admin_key.encode(), ADMIN_API_KEY.encode()):
+        raise HTTPException(status_code=403, detail="Invalid admin key")
+
 def get_user_id_from_token(token_data: dict) -> str:
     """Extract user ID (sub) from Auth0 token"""
     return token_data.get("sub", "")
@@ -144,46 +151,52 @@ def get_user_name_from_token(token_data: dict) -> tuple[str, str]:
     
     return ("", "")
 
-def get_or_create_profile(token_data: dict, db: Session) -> Profile:
-    """Automatically create profile if it doesn't exist, using Auth0 token/userinfo data"""
+async def create_profile_if_missing(token_data: dict, db: AsyncSession) -> bool:
+    """Create the caller's profile from Auth0 token/userinfo data in one atomic upsert.
+
+    Concurrent first logins all issue the same INSERT ... ON CONFLICT DO NOTHING, so
+    exactly one creates the row and nobody sees an IntegrityError. Pass a write session.
+    Returns True if this call created the profile.
+    """
     user_id = get_user_id_from_token(token_data)
-    
     if not user_id:
         raise ValueError("User ID (sub) not found in token/userinfo data")
     
-    profile = db.query(Profile).filter(Profile.id == user_id).first()
-    
-    if not profile:
-        # Extract data BEFORE creating profile
-        email = get_user_email_from_token(token_data)
-        first_name, last_name = get_user_name_from_token(token_data)        
-        
-        profile = Profile(
+    email = get_user_email_from_token(token_data)
+    first_name, last_name = get_user_name_from_token(token_data)
+    result = await db.execute(
+        sqlite_insert(Profile)
+        .values(
             id=user_id,
             email=email if email else None,  # Use None if empty string
             FirstName=first_name,
-            LastName=last_name,
-            avatar_url=None,
-            phone=None
+            LastName=last_name
         )
-        
-        db.add(profile)
-        db.commit()
-        db.refresh(profile)
+        .on_conflict_do_nothing(index_elements=[Profile.id])
+    )
+    created = result.rowcount == 1
+    if created:
+        await profile_changed(db, user_id)
+    await db.commit()
+    known_profiles.add(user_id)
+    return created
+
+async def ensure_profile(token_data: dict, db: AsyncSession) -> str:
+    """Return the caller's user id, creating their profile on first login.
 
-        # If profile exists but is empty, update it
-        if not profile.email or (not profile.FirstName and not profile.LastName):
-            email = get_user_email_from_token(token_data)
-            first_name, last_name = get_user_name_from_token(token_data)
-            
-            if email:
-                profile.email = email
-            if first_name:
-                profile.FirstName = first_name
-            if last_name:
-                profile.LastName = last_name
-            
-            db.commit()
-            db.refresh(profile)
-    
-    return profile
+    Known users are answered from memory, others with a primary-key read on `db`;
+    only a missing profile goes to the write path.
+    """
+    user_id = get_user_id_from_token(token_data)
+    if not user_id:
+        raise ValueError("User ID (sub) not found in token/userinfo data")
+    
+    if user_id in known_profiles:
+        return user_id
+    
+    result = await db.execute(select(Profile.id).where(Profile.id == user_id))
+    if result.scalar_one_or_none() is None:
+        async with AsyncWriteSessionLocal() as write_db:
+            await create_profile_if_missing(token_data, write_db)
+    known_profiles.add(user_id)
+    return user_id
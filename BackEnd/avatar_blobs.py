@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from sqlalchemy import update, case, func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from Models.AvatarBlobModel import AvatarBlob
+from avatar_storage import AVATAR_DIR, blob_path
+from config import AVATAR_GC_GRACE_SECONDS
+
+async def find_blob(db: AsyncSession, content_hash: str) -> Optional[AvatarBlob]:
+    """Return the stored blob for a hash, provided it is safe to reuse and its original is on disk.
+
+    A blob nobody has referenced for half the grace period is treated as gone: the reclaimer
+    may delete its files before the caller gets to acquire it, so the upload stores them afresh.
+    """
+    blob = await db.get(AvatarBlob, content_hash)
+    if blob is None:
+        return None
+    if blob.refcount <= 0:
+        # released_at is CURRENT_TIMESTAMP, i.e. naive UTC
+        reusable_since = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(seconds=AVATAR_GC_GRACE_SECONDS / 2)
+        if blob.released_at is None or blob.released_at < reusable_since:
+            return None
+    exists = await run_in_threadpool((AVATAR_DIR / blob_path(blob.hash, blob.ext)).exists)
+    return blob if exists else None
+
+async def acquire_blob(db: AsyncSession, content_hash: str, ext: str, size: int, variants: dict):
+    """Record one more profile referencing a blob, creating the row on first use"""
+    stmt = sqlite_insert(AvatarBlob).values(
+        hash=content_hash, ext=ext, size=size, variants=variants, refcount=1
+    )
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[AvatarBlob.hash],
+            set_={"refcount": AvatarBlob.refcount + 1, "variants": stmt.excluded.variants, "released_at": None}
+        )
+    )
+
+async def release_blob(db: AsyncSession, content_hash: Optional[str]):
+    """Drop one reference to a blob, stamping released_at when it was the last one.
+
+    Nothing is deleted here. The row stays (refcount 0) for the grace period, and the
+    avatar reclaimer then removes the files and the row together.
+    """
+    if not content_hash:
+        return
+    await db.execute(
+        update(AvatarBlob)
+        .where(AvatarBlob.hash == content_hash)
+        .values(
+            refcount=AvatarBlob.refcount - 1,
+            released_at=case((AvatarBlob.refcount <= 1, func.now()), else_=AvatarBlob.released_at)
+        )
+        .execution_options(synchronize_session=False)
+    )
@@ -0,0 +1,222 @@
+import asyncio
+import os
+import re
+import time
+from pathlib import Path
+from typing import Iterator, NamedTuple, Optional
+from sqlalchemy import select, delete, func, or_
+from starlette.concurrency import run_in_threadpool
+from database import AsyncSessionLocal, AsyncWriteSessionLocal
+from Models.AvatarBlobModel import AvatarBlob
+from Models.ProfileModel import Profile
+from avatar_storage import AVATAR_DIR, TEMP_DIR, avatar_path_for
+from config import AVATAR_GC_INTERVAL, AVATAR_GC_GRACE_SECONDS, AVATAR_GC_BATCH_SIZE
+
+# Files written by the content-addressed store start with the blob's sha256
+BLOB_NAME = re.compile(r"^([0-9a-f]{64})(_\d+)?\.[a-z0-9]+$")
+
+
+class Candidate(NamedTuple):
+    path: Path
+    size: int
+    mtime: float
+
+
+def scan_batches(root: Path, cutoff: float, batch_size: int) -> Iterator[list[Candidate]]:
+    """Walk `root` lazily, yielding files last modified before `cutoff` in batches"""
+    batch = []
+    stack = [root]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except FileNotFoundError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(Path(entry.path))
+                    continue
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                except FileNotFoundError:
+                    continue
+                if st.st_mtime < cutoff:
+                    batch.append(Candidate(Path(entry.path), st.st_size, st.st_mtime))
+                    if len(batch) >= batch_size:
+                        yield batch
+                        batch = []
+    if batch:
+        yield batch
+
+
+def remove_if_unchanged(candidate: Candidate) -> bool:
+    """Unlink a file unless it was rewritten since the scan (e.g. re-uploaded)"""
+    try:
+        if os.stat(candidate.path).st_mtime != candidate.mtime:
+            return False
+        os.unlink(candidate.path)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+class AvatarReclaimer:
+    """Periodically deletes avatar files no profile references any more.
+
+    Request handlers only drop references (AvatarBlob rows, Profile.avatar_url); this
+    sweeps uploads/avatars in batches, checks each batch against the database and
+    removes what is unreferenced and older than the grace period - counted from the
+    blob's released_at, and from the file's mtime for files without a blob row. The
+    rows of reclaimed blobs are deleted afterwards. Stale partial uploads in
+    uploads/tmp are removed too.
+    """
+
+    def __init__(
+        self,
+        interval: float = AVATAR_GC_INTERVAL,
+        grace_seconds: float = AVATAR_GC_GRACE_SECONDS,
+        batch_size: int = AVATAR_GC_BATCH_SIZE
+    ):
+        self.interval = interval
+        self.grace_seconds = grace_seconds
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+        self._last_run: Optional[dict] = None
+        self._total_files = 0
+        self._total_bytes = 0
+
+    async def _legacy_references(self) -> set[Path]:
+        """Files referenced by profiles whose avatar predates content-addressed storage"""
+        referenced = set()
+        async with AsyncSessionLocal() as db:
+            result = await db.stream(
+                select(Profile.avatar_url, Profile.avatar_variants)
+                .where(Profile.avatar_hash.is_(None), Profile.avatar_url.is_not(None))
+                .execution_options(yield_per=self.batch_size)
+            )
+            async for avatar_url, avatar_variants in result:
+                urls = [avatar_url]
+                for files in (avatar_variants or {}).values():
+                    urls.extend(files.values())
+                referenced.update(path for path in map(avatar_path_for, urls) if path is not None)
+        return referenced
+
+    def _grace_cutoff(self):
+        # released_at is CURRENT_TIMESTAMP, so compare on the SQLite clock too
+        return func.datetime("now", f"-{int(self.grace_seconds)} seconds")
+
+    async def _referenced_hashes(self, hashes: set[str]) -> set[str]:
+        """Hashes still in use, or whose last reference was dropped within the grace period.
+
+        The grace period runs from released_at, not from the files' mtime: an old blob's
+        files are kept as long as a recent upload may still be about to reuse them.
+        """
+        if not hashes:
+            return set()
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(AvatarBlob.hash).where(
+                    AvatarBlob.hash.in_(hashes),
+                    or_(AvatarBlob.refcount > 0, AvatarBlob.released_at >= self._grace_cutoff())
+                )
+            )
+            return set(result.scalars())
+
+    async def _forget_released(self) -> int:
+        """Drop the rows of blobs released longer than the grace period ago, once their files are gone"""
+        async with AsyncWriteSessionLocal() as db:
+            result = await db.execute(
+                delete(AvatarBlob).where(
+                    AvatarBlob.refcount <= 0,
+                    or_(AvatarBlob.released_at.is_(None), AvatarBlob.released_at < self._grace_cutoff())
+                )
+            )
+            await db.commit()
+            return result.rowcount
+
+    async def _reclaim(self, candidates: list[Candidate]) -> tuple[int, int]:
+        files = freed = 0
+        for candidate in candidates:
+            if await run_in_threadpool(remove_if_unchanged, candidate):
+                files += 1
+                freed += candidate.size
+        return files, freed
+
+    async def sweep(self) -> dict:
+        """Run one collection pass and return what it reclaimed"""
+        started = time.monotonic()
+        cutoff = time.time() - self.grace_seconds
+        legacy = await self._legacy_references()
+        scanned = removed = reclaimed = 0
+
+        batches = scan_batches(AVATAR_DIR, cutoff, self.batch_size)
+        while batch := await run_in_threadpool(next, batches, None):
+            scanned += len(batch)
+            hashes = {match.group(1) for c in batch if (match := BLOB_NAME.match(c.path.name))}
+            referenced = await self._referenced_hashes(hashes)
+
+            orphans = []
+            for candidate in batch:
+                match = BLOB_NAME.match(candidate.path.name)
+                if match and match.group(1) in referenced:
+                    continue
+                if not match and candidate.path in legacy:
+                    continue
+                orphans.append(candidate)
+
+            files, freed = await self._reclaim(orphans)
+            removed += files
+            reclaimed += freed
+
+        # Rows of the blobs whose files were just reclaimed
+        await self._forget_released()
+
+        # Partial uploads left behind by crashed or aborted requests
+        temp_files = await run_in_threadpool(lambda: [c for batch in scan_batches(TEMP_DIR, cutoff, self.batch_size) for c in batch])
+        files, freed = await self._reclaim(temp_files)
+        removed += files
+        reclaimed += freed
+
+        self._total_files += removed
+        self._total_bytes += reclaimed
+        self._last_run = {
+            "scanned_files": scanned,
+            "removed_files": removed,
+            "reclaimed_bytes": reclaimed,
+            "duration_seconds": round(time.monotonic() - started, 3),
+            "finished_at": time.time()
+        }
+        if removed:
+            print(f"🧹 Avatar GC: removed {removed} files, reclaimed {reclaimed / (1024 * 1024):.1f}MB")
+        return self._last_run
+
+    def stats(self) -> dict:
+        return {
+            "last_run": self._last_run,
+            "total_removed_files": self._total_files,
+            "total_reclaimed_bytes": self._total_bytes
+        }
+
+    async def _run_loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.sweep()
+            except Exception as e:
+                print(f"⚠️ Warning: Avatar GC sweep failed: {e}")
+
+    async def start(self):
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run_loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+avatar_reclaimer = AvatarReclaimer()
@@ -0,0 +1,80 @@
+import asyncio
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+from PIL import Image, ImageOps
+from config import AVATAR_WORKERS, AVATAR_MAX_PENDING
+
+# Square variants generated for every avatar, in pixels
+AVATAR_SIZES = (64, 128, 256, 512)
+AVATAR_FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpg": ("JPEG", {"quality": 85, "optimize": True, "progressive": True}),
+}
+# Refuse decompression bombs instead of just warning (Pillow's default is ~89M pixels)
+MAX_IMAGE_PIXELS = 40_000_000
+
+class AvatarProcessingError(Exception):
+    pass
+
+def process_avatar(source: str, output_dir: str, stem: str) -> dict[str, dict[str, str]]:
+    """Decode, strip metadata, square-crop, downscale and re-encode an avatar.
+
+    Runs in a worker process. Writes `{stem}_{size}.{ext}` for every size and format and
+    returns {size: {format: filename}}. Images are never upscaled.
+    """
+    Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", Image.DecompressionBombWarning)
+        try:
+            with Image.open(source) as original:
+                original.seek(0)  # First frame of animated GIF/WebP
+                image = ImageOps.exif_transpose(original)
+                image.load()
+        except (OSError, ValueError, Image.DecompressionBombError, Image.DecompressionBombWarning) as e:
+            raise AvatarProcessingError(f"Could not decode image: {e}")
+
+    # Re-encoding from pixel data only drops EXIF/ICC/XMP metadata
+    has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+    rgba = image.convert("RGBA") if has_alpha else image.convert("RGB")
+    rgb = rgba if not has_alpha else Image.alpha_composite(Image.new("RGBA", rgba.size, "white"), rgba).convert("RGB")
+
+    variants: dict[str, dict[str, str]] = {}
+    largest = min(image.size)
+    for size in AVATAR_SIZES:
+        side = min(size, largest)
+        files = {}
+        for ext, (pil_format, options) in AVATAR_FORMATS.items():
+            source_image = rgba if ext == "webp" else rgb
+            variant = ImageOps.fit(source_image, (side, side), Image.Resampling.LANCZOS)
+            filename = f"{stem}_{size}.{ext}"
+            temp_path = os.path.join(output_dir, f".{filename}.part")
+            variant.save(temp_path, pil_format, **options)
+            os.replace(temp_path, os.path.join(output_dir, filename))
+            files[ext] = filename
+        variants[str(size)] = files
+    return variants
+
+_executor: Optional[ProcessPoolExecutor] = None
+# Bounds queued jobs so a burst of uploads can't pile up unbounded work in the pool
+_pending = asyncio.Semaphore(AVATAR_MAX_PENDING)
+
+def get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=AVATAR_WORKERS)
+    return _executor
+
+def shutdown_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+
+async def generate_variants(source: Path, output_dir: Path, stem: str) -> dict[str, dict[str, str]]:
+    """Run process_avatar in the process pool so API workers stay responsive"""
+    async with _pending:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_executor(), process_avatar, str(source), str(output_dir), stem)
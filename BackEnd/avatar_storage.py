@@ -0,0 +1,171 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import NamedTuple, Optional
+from fastapi import Request
+from python_multipart.exceptions import MultipartParseError
+from python_multipart.multipart import MultipartParser, parse_options_header
+from starlette.concurrency import run_in_threadpool
+
+UPLOAD_CHUNK_SIZE = 64 * 1024
+AVATAR_DIR = Path("uploads/avatars")
+# Partial uploads land here - same filesystem as AVATAR_DIR so the final rename is atomic,
+# but outside the directory served under /uploads/avatars
+TEMP_DIR = Path("uploads/tmp")
+
+AVATAR_URL_PREFIX = "http://localhost:8000/uploads/avatars/"
+
+class UploadTooLarge(Exception):
+    pass
+
+def sniff_image_type(header: bytes) -> Optional[str]:
+    """Return the file extension for an image's magic bytes, or None if it isn't a supported image"""
+    if header.startswith(b"\x89PNG\r\n\x1a\n"):
+        return ".png"
+    if header.startswith(b"\xff\xd8\xff"):
+        return ".jpg"
+    if header.startswith((b"GIF87a", b"GIF89a")):
+        return ".gif"
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return ".webp"
+    return None
+
+def blob_path(content_hash: str, suffix: str) -> str:
+    """Sharded path of a content-addressed file, relative to AVATAR_DIR: ab/cd/abcd...{suffix}"""
+    return f"{content_hash[:2]}/{content_hash[2:4]}/{content_hash}{suffix}"
+
+class InvalidUpload(Exception):
+    pass
+
+class StreamedUpload(NamedTuple):
+    temp_path: Path
+    filename: str
+    header: bytes  # First bytes of the file, for type sniffing
+    content_hash: str  # sha256 of the content
+
+# Room for the multipart boundaries and part headers around the file itself
+MULTIPART_OVERHEAD = 16 * 1024
+
+async def stream_upload(request: Request, field_name: str, max_size: int) -> StreamedUpload:
+    """Stream one file field of a multipart/form-data request body to a temp file.
+
+    The body is parsed as it arrives with python-multipart's push parser and the file
+    part is written in bounded chunks, off the event loop; nothing is spooled first.
+    Raises UploadTooLarge as soon as the declared Content-Length or the bytes received
+    for the file exceed `max_size`, and InvalidUpload for a malformed body or a missing
+    `field_name` part.
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        raise InvalidUpload("Expected a multipart/form-data body")
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_size + MULTIPART_OVERHEAD:
+        raise UploadTooLarge()
+
+    # Parser callbacks are synchronous: they only note what arrived, the loop below does the I/O
+    part_headers: dict[bytes, bytes] = {}
+    header_field = bytearray()
+    header_value = bytearray()
+    state = {"in_file": False, "done": False, "filename": None}
+    pending: list[bytes] = []
+
+    def on_header_field(data: bytes, start: int, end: int):
+        header_field.extend(data[start:end])
+
+    def on_header_value(data: bytes, start: int, end: int):
+        header_value.extend(data[start:end])
+
+    def on_header_end():
+        part_headers[bytes(header_field).lower()] = bytes(header_value)
+        header_field.clear()
+        header_value.clear()
+
+    def on_headers_finished():
+        _, options = parse_options_header(part_headers.get(b"content-disposition", b""))
+        # Only the first part named `field_name` that is a file is kept; anything else is skipped
+        if not state["done"] and options.get(b"name") == field_name.encode() and b"filename" in options:
+            state["in_file"] = True
+            state["filename"] = options[b"filename"].decode("utf-8", "replace")
+        part_headers.clear()
+
+    def on_part_data(data: bytes, start: int, end: int):
+        if state["in_file"]:
+            pending.append(data[start:end])
+
+    def on_part_end():
+        if state["in_file"]:
+            state["in_file"] = False
+            state["done"] = True
+
+    parser = MultipartParser(params[b"boundary"], {
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end,
+    })
+
+    await run_in_threadpool(TEMP_DIR.mkdir, parents=True, exist_ok=True)
+    fd, temp_name = await run_in_threadpool(tempfile.mkstemp, dir=TEMP_DIR, suffix=".part")
+    temp_path = Path(temp_name)
+    out = os.fdopen(fd, "wb")
+
+    size = 0
+    header = b""
+    digest = hashlib.sha256()
+    try:
+        async for chunk in request.stream():
+            try:
+                parser.write(chunk)
+            except MultipartParseError as e:
+                raise InvalidUpload(f"Malformed multipart body: {e}")
+            if not pending:
+                continue
+            data = b"".join(pending)
+            pending.clear()
+            size += len(data)
+            if size > max_size:
+                raise UploadTooLarge()
+            digest.update(data)
+            if len(header) < 16:
+                header += data[:16 - len(header)]
+            await run_in_threadpool(out.write, data)
+        if not state["done"]:
+            raise InvalidUpload(f"No file provided in the '{field_name}' field")
+        await run_in_threadpool(out.close)
+    except BaseException:
+        out.close()
+        await discard(temp_path)
+        raise
+
+    return StreamedUpload(temp_path, state["filename"], header, digest.hexdigest())
+
+async def move_into_place(temp_path: Path, filename: str) -> Path:
+    """Atomically rename a finished temp file into the avatar directory"""
+    final_path = AVATAR_DIR / filename
+    await run_in_threadpool(final_path.parent.mkdir, parents=True, exist_ok=True)
+    await run_in_threadpool(os.replace, temp_path, final_path)
+    return final_path
+
+async def discard(path: Path):
+    try:
+        await run_in_threadpool(path.unlink, True)
+    except OSError as e:
+        print(f"⚠️ Warning: Could not remove {path}: {e}")
+
+def avatar_url_for(filename: str) -> str:
+    return f"{AVATAR_URL_PREFIX}{filename}"
+
+def variant_urls(variants: dict[str, dict[str, str]]) -> dict[str, dict[str, str]]:
+    return {size: {ext: avatar_url_for(name) for ext, name in files.items()} for size, files in variants.items()}
+
+def avatar_path_for(url: str) -> Optional[Path]:
+    """Map an avatar URL back to its file under AVATAR_DIR, or None if it points elsewhere"""
+    if "uploads/avatars/" not in url:
+        return None
+    relative = Path(url.split("uploads/avatars/")[-1])
+    if relative.is_absolute() or ".." in relative.parts:
+        return None
+    return AVATAR_DIR / relative
@@ -0,0 +1,121 @@
+"""Directory page latency vs table size and page depth.
+
+Seeds profile_summary with N synthetic cards and times GET /api/directory's query
+(browse_directory) for the first page, a page from the middle and the last page. Each
+page is a range scan of the WITHOUT ROWID table starting at the cursor, so all three
+should cost about the same at every N. For comparison, the middle page is also fetched
+with OFFSET, which has to walk past every earlier row.
+
+    cd BackEnd && python benchmarks/directory_browse.py --sizes 10000 100000 1000000
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine, select, func
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from database import Base
+from Models.ProfileModel import Profile  # noqa: F401 - mappers must be registered before querying
+from Models.JobModel import Job  # noqa: F401
+from Models.ServiceModel import Service  # noqa: F401
+from Models.ProjectModel import Project  # noqa: F401
+from Models.SocialLinkModel import SocialLink  # noqa: F401
+from Models.ProfileSummaryModel import ProfileSummary
+from pagination import Cursor, encode_cursor
+from directory import browse_directory, sort_key
+
+FIRST_NAMES = ["Anna", "Nikos", "Maria", "John", "Eleni", "George", "Sofia", "Kostas", "Laura", "Peter"]
+LAST_NAMES = ["Papadopoulos", "Smith", "Georgiou", "Miller", "Ioannou", "Brown", "Nikolaou", "Wilson"]
+SERVICES = ["Web design", "Photography", "Copywriting", "Python", "React", "Consulting", "Illustration"]
+
+
+def seed(path: str, count: int):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine, tables=[ProfileSummary.__table__])
+    rng = random.Random(0)
+    with engine.begin() as conn:
+        batch = []
+        for i in range(count):
+            first, last = rng.choice(FIRST_NAMES), f"{rng.choice(LAST_NAMES)}{i}"
+            batch.append({
+                "sort_name": sort_key(f"{first} {last}"),
+                "profile_id": f"auth0|{i:08d}",
+                "FirstName": first,
+                "LastName": last,
+                "avatar_url": None,
+                "top_services": rng.sample(SERVICES, 3),
+                "service_count": rng.randint(0, 10),
+                "project_count": rng.randint(0, 10),
+                "job_count": rng.randint(0, 5),
+            })
+            if len(batch) >= 10_000:
+                conn.execute(ProfileSummary.__table__.insert(), batch)
+                batch.clear()
+        if batch:
+            conn.execute(ProfileSummary.__table__.insert(), batch)
+    engine.dispose()
+
+
+async def measure(path: str, limit: int, repeat: int) -> dict[str, list[float]]:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+    async with Session() as db:
+        async def cursor_at(position: int) -> str:
+            row = (await db.execute(
+                select(ProfileSummary.sort_name, ProfileSummary.profile_id)
+                .order_by(ProfileSummary.sort_name, ProfileSummary.profile_id)
+                .offset(position).limit(1)
+            )).one()
+            return encode_cursor(Cursor((row.sort_name, row.profile_id), 0))
+
+        total = (await db.execute(select(func.count()).select_from(ProfileSummary))).scalar_one()
+        cursors = {
+            "first page": None,
+            "middle page": await cursor_at(total // 2),
+            "last page": await cursor_at(max(total - limit - 1, 0)),
+        }
+        timings = {name: [] for name in cursors}
+        timings["middle, OFFSET"] = []
+        for _ in range(repeat):
+            for name, cursor in cursors.items():
+                start = time.perf_counter()
+                await browse_directory(db, limit, cursor)
+                timings[name].append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            await db.execute(
+                select(ProfileSummary).where(ProfileSummary.sort_name > "")
+                .order_by(ProfileSummary.sort_name, ProfileSummary.profile_id)
+                .offset(total // 2).limit(limit + 1)
+            )
+            timings["middle, OFFSET"].append((time.perf_counter() - start) * 1000)
+    await engine.dispose()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--limit", type=int, default=20, help="Page size")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'profiles':>10} {'page':>15} {'p50 ms':>9} {'max ms':>9}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = f"{tmp}/directory.db"
+            seed(path, size)
+            timings = asyncio.run(measure(path, args.limit, args.repeat))
+            for name, values in timings.items():
+                print(f"{size:>10} {name:>15} {statistics.median(values):>9.2f} {max(values):>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
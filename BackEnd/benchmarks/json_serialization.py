@@ -0,0 +1,97 @@
+"""Pydantic vs orjson serialization of a full ProfileResponse.
+
+Builds an in-memory profile with N jobs, services, projects and social links each
+and times three ways of turning it into JSON bytes:
+
+- fastapi: response_model validation + jsonable_encoder + json.dumps (FastAPI's default path)
+- pydantic: model_validate(from_attributes) + model_dump_json (the old snapshot path)
+- orjson: fast_json.dump_orm, reading ORM attributes directly without validation
+
+    cd BackEnd && python benchmarks/json_serialization.py --sizes 10 100 500
+"""
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+from Models.ProfileModel import Profile
+from Models.JobModel import Job
+from Models.ServiceModel import Service
+from Models.ProjectModel import Project
+from Models.SocialLinkModel import SocialLink
+from Schemas.ProfileSchema import ProfileResponse
+from fast_json import dump_orm
+
+
+def build_profile(size: int) -> Profile:
+    profile = Profile(id="auth0|bench", FirstName="Bench", LastName="User", created_at=datetime.now(), version=1)
+    profile.jobs = [Job(id=i, profile_id=profile.id, title=f"Job {i}", description="x" * 500, appear=True) for i in range(size)]
+    profile.services = [
+        Service(id=i, profile_id=profile.id, title=f"Service {i}", description="x" * 500, sort_order=i, appear=True)
+        for i in range(size)
+    ]
+    profile.projects = [
+        Project(id=i, profile_id=profile.id, title=f"Project {i}", description="x" * 500, sort_order=i, appear=True)
+        for i in range(size)
+    ]
+    profile.social_links = [
+        SocialLink(id=i, profile_id=profile.id, platform=f"platform{i}", url=f"https://example.com/{i}", appear=True)
+        for i in range(size)
+    ]
+    return profile
+
+
+def fastapi_default(profile: Profile) -> bytes:
+    validated = ProfileResponse.model_validate(profile)
+    return json.dumps(jsonable_encoder(validated)).encode()
+
+
+def pydantic_json(profile: Profile) -> bytes:
+    return ProfileResponse.model_validate(profile).model_dump_json().encode()
+
+
+def orjson_fast(profile: Profile) -> bytes:
+    return dump_orm(ProfileResponse, profile)
+
+
+PATHS = {
+    "fastapi": fastapi_default,
+    "pydantic": pydantic_json,
+    "orjson": orjson_fast,
+}
+
+
+def measure(fn, profile: Profile, repeat: int) -> float:
+    fn(profile)  # Warm up (builds validators/serializers)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(profile)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 500], help="Items per collection")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'size':>6} {'bytes':>9} " + " ".join(f"{name + ' ms':>12}" for name in PATHS) + f" {'speedup':>8}")
+    for size in args.sizes:
+        profile = build_profile(size)
+        # All paths must produce the same document
+        assert json.loads(orjson_fast(profile)) == json.loads(pydantic_json(profile))
+        results = {name: measure(fn, profile, args.repeat) for name, fn in PATHS.items()}
+        print(
+            f"{size:>6} {len(orjson_fast(profile)):>9} "
+            + " ".join(f"{results[name]:>12.3f}" for name in PATHS)
+            + f" {results['fastapi'] / results['orjson']:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
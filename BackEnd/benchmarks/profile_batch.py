@@ -0,0 +1,125 @@
+"""Batch multi-get vs one lookup per id, for a page of N profiles.
+
+Seeds profiles with a few children each and times fetching N of them:
+
+- loop: what N calls to GET /api/profile/{id} do - one snapshot lookup per id, or one
+  five-query eager load per id while snapshots are cold
+- batch: what POST /api/profile/batch does - one IN query for the snapshots, or one IN
+  query per table while cold
+
+HTTP overhead of the N separate requests comes on top of the loop numbers.
+
+    cd BackEnd && python benchmarks/profile_batch.py --counts 10 50 100
+"""
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine, delete, event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import Session
+from database import Base
+from Models.ProfileModel import Profile
+from Models.JobModel import Job
+from Models.ServiceModel import Service
+from Models.ProjectModel import Project
+from Models.SocialLinkModel import SocialLink
+from Models.ProfileSnapshotModel import ProfileSnapshot
+from snapshots import load_profile, serialize_profile, get_or_build_snapshot, get_or_build_snapshots, load_profiles
+
+CHILDREN = 5
+
+
+def seed(path: str, profiles: int):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        for p in range(profiles):
+            profile = Profile(id=f"auth0|{p}", FirstName="Bench", LastName=str(p))
+            profile.jobs = [Job(title=f"Job {i}", description="x" * 200) for i in range(CHILDREN)]
+            profile.services = [Service(title=f"Service {i}", description="x" * 200, sort_order=i) for i in range(CHILDREN)]
+            profile.projects = [Project(title=f"Project {i}", description="x" * 200, sort_order=i) for i in range(CHILDREN)]
+            profile.social_links = [SocialLink(platform=f"platform{i}", url=f"https://example.com/{i}") for i in range(CHILDREN)]
+            db.add(profile)
+        db.commit()
+    engine.dispose()
+
+
+async def loop_cold(db, ids):
+    return [serialize_profile(await load_profile(db, profile_id)) for profile_id in ids]
+
+
+async def batch_cold(db, ids):
+    return [serialize_profile(profile) for profile in await load_profiles(db, ids)]
+
+
+async def loop_snapshots(db, ids):
+    return [await get_or_build_snapshot(db, profile_id) for profile_id in ids]
+
+
+async def batch_snapshots(db, ids):
+    return await get_or_build_snapshots(db, ids)
+
+
+async def measure(sessions, engine, fn, ids, repeat: int) -> tuple[float, int]:
+    statements = 0
+
+    def count(*args):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine.sync_engine, "after_cursor_execute", count)
+    try:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            async with sessions() as db:
+                await fn(db, ids)
+        elapsed = time.perf_counter() - start
+    finally:
+        event.remove(engine.sync_engine, "after_cursor_execute", count)
+    return elapsed / repeat * 1000, statements // repeat
+
+
+async def run(path: str, counts: list[int], repeat: int):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+    print(f"{'ids':>5} {'path':>16} {'ms':>10} {'queries':>8}")
+    for count in counts:
+        ids = [f"auth0|{p}" for p in range(count)]
+        for name, fn in (("loop cold", loop_cold), ("batch cold", batch_cold)):
+            ms, statements = await measure(sessions, engine, fn, ids, repeat)
+            print(f"{count:>5} {name:>16} {ms:>10.2f} {statements:>8}")
+
+        # Materialize the snapshots once, then time the warm read path
+        async with sessions() as db:
+            await get_or_build_snapshots(db, ids)
+        for name, fn in (("loop snapshots", loop_snapshots), ("batch snapshots", batch_snapshots)):
+            ms, statements = await measure(sessions, engine, fn, ids, repeat)
+            print(f"{count:>5} {name:>16} {ms:>10.2f} {statements:>8}")
+        async with sessions() as db:
+            await db.execute(delete(ProfileSnapshot))
+            await db.commit()
+
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 50, 100], help="Profiles per request")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = f"{tmp}/bench.db"
+        seed(path, max(args.counts))
+        asyncio.run(run(path, args.counts, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""joinedload vs selectinload for a full profile load, across profile sizes.
+
+Seeds one profile with N jobs, services, projects and social links each, then times
+loading it with four joinedloads (one cartesian query) and four selectinloads (one
+query per collection), reporting statements issued and result rows fetched.
+
+    cd BackEnd && python benchmarks/profile_loading.py --sizes 5 10 20
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import Session, joinedload, selectinload
+from database import Base
+from Models.ProfileModel import Profile
+from Models.JobModel import Job
+from Models.ServiceModel import Service
+from Models.ProjectModel import Project
+from Models.SocialLinkModel import SocialLink
+
+STRATEGIES = {
+    "joinedload": joinedload,
+    "selectinload": selectinload,
+}
+
+
+def seed(engine, size: int):
+    with Session(engine) as db:
+        profile = Profile(id="auth0|bench", FirstName="Bench", LastName="User")
+        profile.jobs = [Job(title=f"Job {i}", description="x" * 200) for i in range(size)]
+        profile.services = [Service(title=f"Service {i}", description="x" * 200, sort_order=i) for i in range(size)]
+        profile.projects = [Project(title=f"Project {i}", description="x" * 200, sort_order=i) for i in range(size)]
+        profile.social_links = [SocialLink(platform=f"platform{i}", url=f"https://example.com/{i}") for i in range(size)]
+        db.add(profile)
+        db.commit()
+
+
+def measure(engine, loader, repeat: int) -> dict:
+    stats = {"statements": 0, "rows": 0}
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stats["statements"] += 1
+
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+    try:
+        stmt = select(Profile).options(
+            loader(Profile.jobs),
+            loader(Profile.services),
+            loader(Profile.projects),
+            loader(Profile.social_links)
+        ).where(Profile.id == "auth0|bench")
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            with Session(engine) as db:
+                profile = db.execute(stmt).unique().scalar_one()
+                assert profile.jobs and profile.services and profile.projects and profile.social_links
+        elapsed = time.perf_counter() - start
+    finally:
+        event.remove(engine, "after_cursor_execute", after_cursor_execute)
+
+    # Raw rows the database hands back for one load
+    with engine.connect() as conn:
+        if loader is joinedload:
+            stats["rows"] = len(conn.execute(stmt).all())
+        else:
+            stats["rows"] = 1 + sum(
+                len(conn.execute(select(model).where(model.profile_id == "auth0|bench")).all())
+                for model in (Job, Service, Project, SocialLink)
+            )
+
+    return {
+        "ms": elapsed / repeat * 1000,
+        "statements": stats["statements"] // repeat,
+        "rows": stats["rows"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 10, 20], help="Items per collection")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'size':>5} {'strategy':>13} {'ms/load':>10} {'queries':>8} {'rows':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            engine = create_engine(f"sqlite:///{tmp}/bench_{size}.db")
+            Base.metadata.create_all(engine)
+            seed(engine, size)
+            for name, loader in STRATEGIES.items():
+                # Cartesian loads blow up quickly; keep the large sizes bounded in time
+                repeat = max(1, args.repeat // (size // 10 + 1)) if loader is joinedload else args.repeat
+                result = measure(engine, loader, repeat)
+                print(f"{size:>5} {name:>13} {result['ms']:>10.2f} {result['statements']:>8} {result['rows']:>10}")
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Throughput and memory of the NDJSON profile export and import.
+
+Seeds N profiles with CHILDREN jobs, services, projects and social links each, exports
+them with transfer.export_profiles (what GET /api/admin/export and `cli.py profiles
+export` run), imports the file into an empty database with transfer.import_profiles,
+and reports rows per second for both. A second, traced export reports the peak Python
+heap, which should stay flat as N grows.
+
+    cd BackEnd && python benchmarks/profile_transfer.py --profiles 10000 100000
+"""
+import argparse
+import asyncio
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from database import Base, SEARCH_TABLE_DDL, apply_sqlite_pragmas
+from transfer import export_profiles, import_profiles
+from config import TRANSFER_BATCH_SIZE
+
+CHILDREN = 3
+
+
+def create_schema(path: str):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text(SEARCH_TABLE_DDL))
+    engine.dispose()
+
+
+def seed(path: str, profiles: int):
+    create_schema(path)
+    conn = sqlite3.connect(path)
+    apply_sqlite_pragmas(conn)
+    description = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 3
+    child_id = 0
+    for start in range(0, profiles, 10_000):
+        ids = [f"auth0|{p:08d}" for p in range(start, min(start + 10_000, profiles))]
+        conn.executemany(
+            "INSERT INTO profiles (id, created_at, FirstName, LastName, email, version) "
+            "VALUES (?, CURRENT_TIMESTAMP, 'Bench', ?, ?, 1)",
+            [(profile_id, profile_id[-8:], f"{profile_id[-8:]}@example.com") for profile_id in ids]
+        )
+        for table, columns, values in (
+            ("jobs", "title, description, appear", lambda i: (f"Job {i}", description, 1)),
+            ("services", "title, description, sort_order, appear", lambda i: (f"Service {i}", description, i, 1)),
+            ("projects", "title, description, project_link, sort_order, appear", lambda i: (f"Project {i}", description, None, i, 1)),
+            ("social_links", "platform, url, appear", lambda i: (f"platform{i}", f"https://example.com/{i}", 1)),
+        ):
+            placeholders = ", ".join("?" * (len(columns.split(",")) + 2))
+            rows = []
+            for profile_id in ids:
+                for i in range(CHILDREN):
+                    child_id += 1
+                    rows.append((child_id, profile_id, *values(i)))
+            conn.executemany(f"INSERT INTO {table} (id, profile_id, {columns}) VALUES ({placeholders})", rows)
+        conn.commit()
+    conn.close()
+
+
+def async_sessions(path: str):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    event.listen(engine.sync_engine, "connect", lambda dbapi_connection, record: apply_sqlite_pragmas(dbapi_connection))
+    return engine, async_sessionmaker(engine, expire_on_commit=False)
+
+
+async def export(source: str, output: str, batch_size: int) -> tuple[int, float]:
+    engine, sessions = async_sessions(source)
+    rows = 0
+
+    def count(profiles: int, batch_rows: int):
+        nonlocal rows
+        rows += batch_rows
+
+    start = time.perf_counter()
+    with open(output, "wb") as file:
+        async with sessions() as db:
+            async for chunk in export_profiles(db, batch_size, on_batch=count):
+                file.write(chunk)
+    elapsed = time.perf_counter() - start
+    await engine.dispose()
+    return rows, elapsed
+
+
+async def load(target: str, source: str, batch_size: int) -> tuple[int, float]:
+    create_schema(target)
+    engine, sessions = async_sessions(target)
+    start = time.perf_counter()
+    with open(source, "rb") as file:
+        async with sessions() as db:
+            stats = await import_profiles(db, file, batch_size)
+    elapsed = time.perf_counter() - start
+    await engine.dispose()
+    return stats.rows, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--batch-size", type=int, default=TRANSFER_BATCH_SIZE)
+    args = parser.parse_args()
+
+    print(f"{'profiles':>9} {'rows':>9} {'MB':>7} {'export rows/s':>14} {'import rows/s':>14} {'export peak MB':>15}")
+    for profiles in args.profiles:
+        with tempfile.TemporaryDirectory() as tmp:
+            source, target, dump = f"{tmp}/source.db", f"{tmp}/target.db", f"{tmp}/profiles.ndjson"
+            seed(source, profiles)
+
+            rows, export_seconds = asyncio.run(export(source, dump, args.batch_size))
+            imported, import_seconds = asyncio.run(load(target, dump, args.batch_size))
+            assert imported == rows, f"imported {imported} of {rows} rows"
+
+            tracemalloc.start()
+            asyncio.run(export(source, f"{tmp}/traced.ndjson", args.batch_size))
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            size = Path(dump).stat().st_size / 1024 / 1024
+            print(
+                f"{profiles:>9} {rows:>9} {size:>7.1f} {rows / export_seconds:>14.0f} "
+                f"{rows / import_seconds:>14.0f} {peak / 1024 / 1024:>15.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
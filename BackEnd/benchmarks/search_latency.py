@@ -0,0 +1,121 @@
+"""Latency of /api/search queries against an FTS5 index of N profiles.
+
+Seeds a throwaway database with N synthetic profiles (names plus service, project and
+job text drawn from a fixed vocabulary) using the same table definition and document
+builder as the app, then runs the endpoint's query for common words, rare words, prefixes
+and multi-word queries, reporting p50/p95/max per query in milliseconds.
+
+    cd BackEnd && python benchmarks/search_latency.py --profiles 100000
+"""
+import argparse
+import json
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import SQLITE_PRAGMAS
+from database import SEARCH_TABLE_DDL, apply_sqlite_pragmas
+from search import PAGE_SQL, SEARCH_SQL, build_match_query, search_document
+
+FIRST_NAMES = ["Anna", "Nikos", "Maria", "John", "Eleni", "George", "Sofia", "Kostas", "Laura", "Peter"]
+LAST_NAMES = ["Papadopoulos", "Smith", "Georgiou", "Miller", "Ioannou", "Brown", "Nikolaou", "Wilson"]
+SKILLS = [
+    "photography", "design", "branding", "illustration", "copywriting", "marketing", "python",
+    "react", "consulting", "video", "editing", "animation", "translation", "accounting", "coaching",
+]
+FILLER = "reliable experienced creative clients projects delivery quality modern professional".split()
+
+QUERIES = {
+    "common word": "design",
+    "rare word": "zyzzyva",
+    "prefix (2 chars)": "ph",
+    "prefix (4 chars)": "phot",
+    "two words": "python react",
+    "name + skill": "anna photo",
+}
+
+
+def text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(SKILLS) if rng.random() < 0.3 else rng.choice(FILLER) for _ in range(words))
+
+
+def seed(conn: sqlite3.Connection, profiles: int):
+    rng = random.Random(42)
+    conn.execute("CREATE TABLE profiles (id TEXT PRIMARY KEY, FirstName TEXT, LastName TEXT, avatar_url TEXT)")
+    conn.execute(SEARCH_TABLE_DDL)
+    batch_profiles, batch_docs = [], []
+    for i in range(profiles):
+        profile = {
+            "id": f"auth0|{i}",
+            "FirstName": rng.choice(FIRST_NAMES),
+            "LastName": rng.choice(LAST_NAMES),
+            "services": [{"title": rng.choice(SKILLS).title(), "description": text(rng, 30)} for _ in range(3)],
+            "projects": [{"title": f"Project {j}", "description": text(rng, 40)} for j in range(3)],
+            "jobs": [{"title": rng.choice(SKILLS).title(), "description": text(rng, 20)} for _ in range(2)],
+        }
+        if i == profiles // 2:
+            profile["projects"][0]["description"] += " zyzzyva"
+        batch_profiles.append((profile["id"], profile["FirstName"], profile["LastName"], None))
+        batch_docs.append(search_document(profile))
+        if len(batch_docs) >= 5000:
+            flush(conn, batch_profiles, batch_docs)
+    flush(conn, batch_profiles, batch_docs)
+    conn.execute("INSERT INTO profile_search (profile_search) VALUES ('optimize')")
+    conn.commit()
+
+
+def flush(conn: sqlite3.Connection, profiles: list, docs: list):
+    conn.executemany("INSERT INTO profiles VALUES (?, ?, ?, ?)", profiles)
+    conn.executemany(
+        "INSERT INTO profile_search (rowid, profile_id, name, services, projects, jobs) "
+        "VALUES (:rowid, :profile_id, :name, :services, :projects, :jobs)",
+        docs
+    )
+    profiles.clear()
+    docs.clear()
+
+
+def measure(conn: sqlite3.Connection, q: str, limit: int, repeat: int) -> tuple[list[float], int]:
+    params = {"query": build_match_query(q), "after_score": None, "after_rowid": None, "limit": limit + 1}
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        hits = conn.execute(SEARCH_SQL, params).fetchall()
+        if hits:
+            rowids = json.dumps([rowid for rowid, _ in hits])
+            conn.execute(PAGE_SQL, {"query": params["query"], "rowids": rowids}).fetchall()
+        timings.append((time.perf_counter() - start) * 1000)
+    matches = conn.execute("SELECT count(*) FROM profile_search WHERE profile_search MATCH ?", (params["query"],)).fetchone()[0]
+    return timings, matches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", type=int, default=100_000)
+    parser.add_argument("--limit", type=int, default=20, help="Page size")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(f"{tmp}/search.db")
+        apply_sqlite_pragmas(conn, SQLITE_PRAGMAS)
+        start = time.perf_counter()
+        seed(conn, args.profiles)
+        print(f"Seeded and indexed {args.profiles} profiles in {time.perf_counter() - start:.1f}s")
+
+        print(f"{'query':>18} {'matches':>9} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+        for name, q in QUERIES.items():
+            timings, matches = measure(conn, q, args.limit, args.repeat)
+            p95 = statistics.quantiles(timings, n=20, method="inclusive")[-1] if len(timings) > 1 else timings[0]
+            print(f"{name:>18} {matches:>9} {statistics.median(timings):>9.2f} {p95:>9.2f} {max(timings):>9.2f}")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Read/write concurrency of the stock SQLite setup vs the tuned profile in database.py.
+
+Runs N reader threads and one writer thread against a seeded database for a fixed time,
+once without PRAGMAs (rollback journal) and once with SQLITE_PRAGMAS applied.
+
+    cd BackEnd && python benchmarks/sqlite_concurrency.py --readers 8 --seconds 5
+"""
+import argparse
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import SQLITE_PRAGMAS
+from database import apply_sqlite_pragmas
+
+
+def seed(path: Path, profiles: int, rows_per_profile: int):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE projects (id INTEGER PRIMARY KEY, profile_id TEXT, title TEXT, description TEXT, sort_order INTEGER)")
+    conn.execute("CREATE INDEX ix_projects_profile ON projects (profile_id, sort_order)")
+    conn.executemany(
+        "INSERT INTO projects (profile_id, title, description, sort_order) VALUES (?, ?, ?, ?)",
+        (
+            (f"auth0|{p}", f"Project {i}", "x" * 200, i)
+            for p in range(profiles)
+            for i in range(rows_per_profile)
+        )
+    )
+    conn.commit()
+    conn.close()
+
+
+def run(path: Path, pragmas: dict, readers: int, seconds: float, profiles: int) -> dict:
+    stop = threading.Event()
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    lock = threading.Lock()
+
+    def connect():
+        conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        apply_sqlite_pragmas(conn, pragmas)
+        return conn
+
+    def reader(n: int):
+        conn = connect()
+        done = errors = 0
+        i = n
+        while not stop.is_set():
+            try:
+                conn.execute(
+                    "SELECT id, title, description FROM projects WHERE profile_id = ? ORDER BY sort_order",
+                    (f"auth0|{i % profiles}",)
+                ).fetchall()
+                done += 1
+            except sqlite3.OperationalError:
+                errors += 1
+            i += readers
+        conn.close()
+        with lock:
+            counts["reads"] += done
+            counts["errors"] += errors
+
+    def writer():
+        conn = connect()
+        done = errors = 0
+        while not stop.is_set():
+            try:
+                conn.execute(
+                    "INSERT INTO projects (profile_id, title, description, sort_order) VALUES (?, ?, ?, ?)",
+                    (f"auth0|{done % profiles}", "New project", "y" * 200, done)
+                )
+                conn.commit()
+                done += 1
+            except sqlite3.OperationalError:
+                errors += 1
+        conn.close()
+        with lock:
+            counts["writes"] += done
+            counts["errors"] += errors
+
+    threads = [threading.Thread(target=reader, args=(n,)) for n in range(readers)]
+    threads.append(threading.Thread(target=writer))
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    return {key: value / seconds if key != "errors" else value for key, value in counts.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--profiles", type=int, default=500)
+    parser.add_argument("--rows", type=int, default=20, help="Projects per profile")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, pragmas in (("stock", {}), ("tuned", SQLITE_PRAGMAS)):
+            path = Path(tmp) / f"{label}.db"
+            seed(path, args.profiles, args.rows)
+            result = run(path, pragmas, args.readers, args.seconds, args.profiles)
+            print(
+                f"{label:>6}: {result['reads']:>10.0f} reads/s  "
+                f"{result['writes']:>8.0f} writes/s  {result['errors']} errors"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+from typing import NamedTuple
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy import select, insert, update, delete, case
+from sqlalchemy.ext.asyncio import AsyncSession
+from Schemas.BulkSchema import BulkItemResult
+
+MAX_BULK_ITEMS = 500
+
+class BulkOutcome(NamedTuple):
+    results: list[BulkItemResult]
+    written: bool  # False when every item was not_found (or there were none) - nothing to invalidate
+
+async def apply_bulk(
+    db: AsyncSession,
+    model,
+    profile_id: str,
+    request: BaseModel,
+    fields: tuple[str, ...]
+) -> BulkOutcome:
+    """Apply a bulk create/update/reorder/delete request for one profile's items.
+
+    Each kind of operation is a single statement - executemany INSERT ... RETURNING,
+    executemany UPDATE by primary key, one UPDATE ... CASE for sort orders, one
+    DELETE ... IN - all in the caller's transaction. Items that don't exist or belong
+    to another profile are reported as not_found instead of failing the request.
+    Callers should only run profile_changed when the outcome says a row was written.
+    """
+    creates = request.create
+    updates = request.update
+    reorders = getattr(request, "reorder", [])
+    deletes = request.delete
+
+    if len(creates) + len(updates) + len(reorders) + len(deletes) > MAX_BULK_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many items. A bulk request may contain at most {MAX_BULK_ITEMS} items."
+        )
+
+    results: list[BulkItemResult] = []
+
+    # One lookup for every id we're asked to touch, limited to this profile's rows
+    requested_ids = {item.id for item in updates} | {item.id for item in reorders} | set(deletes)
+    owned_ids = set()
+    if requested_ids:
+        result = await db.execute(
+            select(model.id).where(model.id.in_(requested_ids), model.profile_id == profile_id)
+        )
+        owned_ids = set(result.scalars().all())
+
+    def row_values(item) -> dict:
+        values = {field: getattr(item, field) for field in fields}
+        if "sort_order" in values:
+            values["sort_order"] = values["sort_order"] or 0
+        return values
+
+    if creates:
+        result = await db.execute(
+            insert(model).returning(model.id, sort_by_parameter_order=True),
+            [{"profile_id": profile_id, **row_values(item)} for item in creates]
+        )
+        for index, new_id in enumerate(result.scalars().all()):
+            results.append(BulkItemResult(op="create", index=index, id=new_id, status="created"))
+
+    if updates:
+        rows = [{"id": item.id, **row_values(item)} for item in updates if item.id in owned_ids]
+        if rows:
+            await db.execute(update(model).execution_options(synchronize_session=False), rows)
+        for index, item in enumerate(updates):
+            found = item.id in owned_ids
+            results.append(BulkItemResult(op="update", index=index, id=item.id, status="updated" if found else "not_found"))
+
+    if reorders:
+        new_orders = {item.id: item.sort_order for item in reorders if item.id in owned_ids}
+        if new_orders:
+            await db.execute(
+                update(model)
+                .where(model.id.in_(new_orders.keys()))
+                .values(sort_order=case(new_orders, value=model.id))
+                .execution_options(synchronize_session=False)
+            )
+        for index, item in enumerate(reorders):
+            found = item.id in owned_ids
+            results.append(BulkItemResult(op="reorder", index=index, id=item.id, status="updated" if found else "not_found"))
+
+    if deletes:
+        delete_ids = [item_id for item_id in deletes if item_id in owned_ids]
+        if delete_ids:
+            await db.execute(
+                delete(model).where(model.id.in_(delete_ids)).execution_options(synchronize_session=False)
+            )
+        for index, item_id in enumerate(deletes):
+            found = item_id in owned_ids
+            results.append(BulkItemResult(op="delete", index=index, id=item_id, status="deleted" if found else "not_found"))
+
+    written = any(result.status != "not_found" for result in results)
+    return BulkOutcome(results, written)
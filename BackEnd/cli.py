@@ -0,0 +1,185 @@
+"""BioConnect maintenance commands.
+
+    cd BackEnd && python cli.py search rebuild
+    cd BackEnd && python cli.py directory rebuild
+    cd BackEnd && python cli.py profiles export profiles.ndjson
+    cd BackEnd && python cli.py profiles import profiles.ndjson
+"""
+import argparse
+import asyncio
+import contextlib
+import sys
+import time
+from typing import AsyncIterator
+from sqlalchemy import select, delete, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import init_db, AsyncSessionLocal, AsyncWriteSessionLocal, dispose_engines
+from Models.ProfileModel import Profile
+from Models.ProfileSummaryModel import ProfileSummary
+from Models.JobModel import Job  # noqa: F401 - mappers must be registered before loading
+from Models.ServiceModel import Service  # noqa: F401
+from Models.ProjectModel import Project  # noqa: F401
+from Models.SocialLinkModel import SocialLink  # noqa: F401
+from Schemas.ProfileSchema import ProfileResponse
+from fast_json import orm_serializer
+from snapshots import load_profiles
+from search import UPSERT_SQL, search_document
+from directory import summary_row
+from transfer import export_profiles, import_profiles, ImportStats
+from config import TRANSFER_BATCH_SIZE
+
+BATCH_SIZE = 500
+
+
+async def profile_batches(db: AsyncSession, batch_size: int) -> AsyncIterator[list[dict]]:
+    """Every profile serialized as a ProfileResponse dict, in id-keyset batches"""
+    serialize = orm_serializer(ProfileResponse)
+    last_id = ""
+    while True:
+        result = await db.execute(
+            select(Profile.id).where(Profile.id > last_id).order_by(Profile.id).limit(batch_size)
+        )
+        ids = list(result.scalars())
+        if not ids:
+            return
+        profiles = await load_profiles(db, ids)
+        yield [serialize(profile) for profile in profiles]
+        db.expunge_all()
+        last_id = ids[-1]
+
+
+async def rebuild_search_index(batch_size: int = BATCH_SIZE):
+    """Re-index every profile in one write transaction, so searches never see a half-built index"""
+    started = time.perf_counter()
+    indexed = 0
+
+    async with AsyncSessionLocal() as read_db, AsyncWriteSessionLocal() as write_db:
+        await write_db.execute(text("DELETE FROM profile_search"))
+        async for profiles in profile_batches(read_db, batch_size):
+            await write_db.execute(UPSERT_SQL, [search_document(profile) for profile in profiles])
+            indexed += len(profiles)
+            print(f"  indexed {indexed} profiles", end="\r")
+
+        await write_db.execute(text("INSERT INTO profile_search (profile_search) VALUES ('optimize')"))
+        await write_db.commit()
+
+    elapsed = time.perf_counter() - started
+    print(f"✅ Indexed {indexed} profiles in {elapsed:.1f}s ({indexed / elapsed if elapsed else 0:.0f} profiles/s)")
+
+
+async def rebuild_directory(batch_size: int = BATCH_SIZE):
+    """Rebuild every profile_summary row in one write transaction"""
+    started = time.perf_counter()
+    rebuilt = 0
+
+    async with AsyncSessionLocal() as read_db, AsyncWriteSessionLocal() as write_db:
+        await write_db.execute(delete(ProfileSummary))
+        async for profiles in profile_batches(read_db, batch_size):
+            await write_db.execute(ProfileSummary.__table__.insert(), [summary_row(profile) for profile in profiles])
+            rebuilt += len(profiles)
+            print(f"  summarized {rebuilt} profiles", end="\r")
+        await write_db.commit()
+
+    elapsed = time.perf_counter() - started
+    print(f"✅ Rebuilt {rebuilt} directory entries in {elapsed:.1f}s ({rebuilt / elapsed if elapsed else 0:.0f} profiles/s)")
+
+
+def _rate(count: int, elapsed: float) -> str:
+    return f"{count / elapsed if elapsed else 0:.0f}"
+
+
+async def export_to_file(path: str, batch_size: int = TRANSFER_BATCH_SIZE):
+    """Write every profile as NDJSON to `path` ("-" for stdout); progress goes to stderr"""
+    started = time.perf_counter()
+    exported = rows = 0
+
+    def progress(profiles: int, batch_rows: int):
+        nonlocal exported, rows
+        exported, rows = exported + profiles, rows + batch_rows
+        print(f"  exported {exported} profiles ({rows} rows)", end="\r", file=sys.stderr)
+
+    output = sys.stdout.buffer if path == "-" else open(path, "wb")
+    try:
+        async with AsyncSessionLocal() as db:
+            async for chunk in export_profiles(db, batch_size, on_batch=progress):
+                output.write(chunk)
+    finally:
+        if output is not sys.stdout.buffer:
+            output.close()
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"✅ Exported {exported} profiles, {rows} rows in {elapsed:.1f}s ({_rate(rows, elapsed)} rows/s)",
+        file=sys.stderr
+    )
+
+
+async def import_from_file(path: str, batch_size: int = TRANSFER_BATCH_SIZE):
+    """Insert profiles from an NDJSON export, one transaction per batch"""
+    started = time.perf_counter()
+
+    def progress(stats: ImportStats):
+        print(f"  imported {stats.profiles} profiles ({stats.rows} rows)", end="\r")
+
+    source = sys.stdin.buffer if path == "-" else open(path, "rb")
+    try:
+        async with AsyncWriteSessionLocal() as db:
+            stats = await import_profiles(db, source, batch_size, on_batch=progress)
+    finally:
+        if source is not sys.stdin.buffer:
+            source.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"✅ Imported {stats.profiles} profiles, {stats.rows} rows in {elapsed:.1f}s ({_rate(stats.rows, elapsed)} rows/s)")
+    if stats.skipped:
+        print(f"⚠️ Warning: Skipped {stats.skipped} profiles that already exist")
+    if stats.skipped_children:
+        print(f"⚠️ Warning: Skipped {stats.skipped_children} jobs/services/projects/social links whose id was already taken")
+
+
+async def _run(coro):
+    try:
+        await coro
+    finally:
+        await dispose_engines()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    search = commands.add_parser("search", help="Full-text search index")
+    search_commands = search.add_subparsers(dest="action", required=True)
+    rebuild = search_commands.add_parser("rebuild", help="Rebuild the index from the profiles table")
+    rebuild.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+
+    directory = commands.add_parser("directory", help="Profile directory summaries")
+    directory_commands = directory.add_subparsers(dest="action", required=True)
+    rebuild = directory_commands.add_parser("rebuild", help="Rebuild profile_summary from the profiles table")
+    rebuild.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+
+    profiles = commands.add_parser("profiles", help="NDJSON export and import of profiles with their children")
+    profile_commands = profiles.add_subparsers(dest="action", required=True)
+    export = profile_commands.add_parser("export", help="Write every profile to an NDJSON file")
+    export.add_argument("path", help='Output file, or "-" for stdout')
+    export.add_argument("--batch-size", type=int, default=TRANSFER_BATCH_SIZE)
+    load = profile_commands.add_parser("import", help="Insert profiles from an NDJSON export")
+    load.add_argument("path", help='Input file, or "-" for stdin')
+    load.add_argument("--batch-size", type=int, default=TRANSFER_BATCH_SIZE, help="Profiles per transaction")
+
+    args = parser.parse_args()
+    # Keep stdout clean for `profiles export -`
+    with contextlib.redirect_stdout(sys.stderr):
+        init_db()
+    if args.command == "search" and args.action == "rebuild":
+        asyncio.run(_run(rebuild_search_index(args.batch_size)))
+    elif args.command == "directory" and args.action == "rebuild":
+        asyncio.run(_run(rebuild_directory(args.batch_size)))
+    elif args.command == "profiles" and args.action == "export":
+        asyncio.run(_run(export_to_file(args.path, args.batch_size)))
+    elif args.command == "profiles" and args.action == "import":
+        asyncio.run(_run(import_from_file(args.path, args.batch_size)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+import gzip
+import hashlib
+import zlib
+from collections import OrderedDict
+from typing import Optional
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from config import (
+    COMPRESSION_MIN_SIZE, COMPRESSION_GZIP_LEVEL, COMPRESSION_BROTLI_QUALITY, COMPRESSION_CACHE_MAX_BYTES
+)
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick br or gzip from Accept-Encoding, honouring q=0"""
+    accepted = {}
+    for item in (accept_encoding or "").split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if coding:
+            accepted[coding.strip().lower()] = q
+    wildcard = accepted.get("*", 0.0)
+    if brotli is not None and accepted.get("br", wildcard) > 0:
+        return "br"
+    if accepted.get("gzip", wildcard) > 0:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+class StreamCompressor:
+    """Incremental compressor for streaming bodies"""
+
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=COMPRESSION_BROTLI_QUALITY)
+            self._flush = self._compressor.flush
+            self._finish = self._compressor.finish
+            self._process = self._compressor.process
+        else:
+            self._compressor = zlib.compressobj(COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            self._process = self._compressor.compress
+            self._flush = lambda: self._compressor.flush(zlib.Z_SYNC_FLUSH)
+            self._finish = self._compressor.flush
+
+    def feed(self, data: bytes, more: bool) -> bytes:
+        # Sync-flush each chunk so streamed lines reach the client without waiting for the end
+        return self._process(data) + (self._flush() if more else self._finish())
+
+
+class CompressedBodyCache:
+    """LRU of compressed bodies keyed by (encoding, hash of the uncompressed body), so hot
+    snapshot and cached list responses are compressed once per content rather than once
+    per request. Keyed on the content itself: ETags (profile versions) can repeat for
+    different bodies, e.g. after a profile is deleted and recreated."""
+
+    def __init__(self, max_bytes: int = COMPRESSION_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple[str, bytes], bytes] = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key_for(encoding: str, body: bytes) -> tuple[str, bytes]:
+        return encoding, hashlib.blake2b(body, digest_size=16).digest()
+
+    def get(self, key: tuple[str, bytes]) -> Optional[bytes]:
+        body = self._entries.get(key)
+        if body is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return body
+
+    def set(self, key: tuple[str, bytes], body: bytes):
+        if len(body) > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size -= len(previous)
+        self._entries[key] = body
+        self._size += len(body)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0
+        }
+
+
+compressed_body_cache = CompressedBodyCache()
+
+
+class CompressionMiddleware:
+    """Compresses JSON and text responses with brotli or gzip, negotiated per request.
+
+    Skips bodies under `minimum_size`, already-encoded responses, non-text media and
+    `exclude_paths` (e.g. /uploads, which serves images and its own precompressed files).
+    Bodies with a strong ETag are likely to be served again, so their compressed form is
+    kept in compressed_body_cache, looked up by the body's content hash.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = COMPRESSION_MIN_SIZE,
+        exclude_paths: tuple[str, ...] = (),
+        cache: CompressedBodyCache = compressed_body_cache
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.exclude_paths = exclude_paths
+        self.cache = cache
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"].startswith(self.exclude_paths):
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"))
+        responder = _CompressionResponder(send, encoding, self.minimum_size, self.cache)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, send: Send, encoding: Optional[str], minimum_size: int, cache: CompressedBodyCache):
+        self._send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.cache = cache
+        self.start: Optional[Message] = None
+        self.active = False
+        self.compressor: Optional[StreamCompressor] = None
+        self.started = False
+
+    def _eligible(self, headers: MutableHeaders) -> bool:
+        if self.start["status"] < 200 or self.start["status"] in (204, 206, 304):
+            return False
+        if "content-encoding" in headers or "content-range" in headers:
+            return False
+        content_type = headers.get("content-type", "")
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+    async def send(self, message: Message):
+        if message["type"] == "http.response.start":
+            # Hold the start until the first body chunk tells us the size
+            self.start = message
+            return
+
+        if self.started:
+            if self.compressor is not None and message["type"] == "http.response.body":
+                more = message.get("more_body", False)
+                body = self.compressor.feed(message.get("body", b""), more)
+                await self._send({"type": "http.response.body", "body": body, "more_body": more})
+            else:
+                await self._send(message)
+            return
+
+        if message["type"] != "http.response.body":
+            # e.g. a zero-copy file body; pass through untouched
+            self.started = True
+            await self._send(self.start)
+            await self._send(message)
+            return
+
+        self.started = True
+        headers = MutableHeaders(raw=self.start["headers"])
+        body = message.get("body", b"")
+        more = message.get("more_body", False)
+
+        if not self._eligible(headers):
+            await self._send(self.start)
+            await self._send(message)
+            return
+
+        headers.add_vary_header("Accept-Encoding")
+        if self.encoding is None or (not more and len(body) < self.minimum_size):
+            await self._send(self.start)
+            await self._send(message)
+            return
+
+        headers["content-encoding"] = self.encoding
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            # The compressed representation's bytes differ, so its validator becomes weak
+            headers["etag"] = f"W/{etag}"
+
+        if more:
+            del headers["content-length"]
+            self.compressor = StreamCompressor(self.encoding)
+            await self._send(self.start)
+            await self._send({"type": "http.response.body", "body": self.compressor.feed(body, True), "more_body": True})
+            return
+
+        cache_key = self.cache.key_for(self.encoding, body) if etag and not etag.startswith("W/") else None
+        compressed = self.cache.get(cache_key) if cache_key is not None else None
+        if compressed is None:
+            compressed = compress(body, self.encoding)
+            if cache_key is not None:
+                self.cache.set(cache_key, compressed)
+        headers["content-length"] = str(len(compressed))
+        await self._send(self.start)
+        await self._send({"type": "http.response.body", "body": compressed, "more_body": False})
@@ -16,5 +16,77 @@ ALGORITHMS = ["RS256"]
 if not AUTH0_DOMAIN or not AUTH0_AUDIENCE or not AUTH0_CLIENT_ID or not AUTH0_CLIENT_SECRET:
     raise ValueError("AUTH0_DOMAIN, AUTH0_AUDIENCE, AUTH0_CLIENT_ID, and AUTH0_CLIENT_SECRET must be set in .env file")
 
+# Outbound HTTP (Auth0) client
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "false").lower() in ("1", "true", "yes")
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+
+# Concurrent /api/auth/refresh calls with the same refresh token share one Auth0 call;
+# its successful result is reused for this many seconds to cover stragglers
+REFRESH_RESULT_TTL = float(os.getenv("REFRESH_RESULT_TTL", "10"))
+
+# JWKS Config
+JWKS_TTL_SECONDS = int(os.getenv("JWKS_TTL_SECONDS", "3600"))  # Background refresh interval
+JWKS_MIN_REFRESH_INTERVAL = int(os.getenv("JWKS_MIN_REFRESH_INTERVAL", "30"))  # Rate limit for unknown-kid refetches
+
+# Verified-token cache
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+
+# User ids with an existing profile, so /api/profile/me skips the create path
+KNOWN_PROFILES_CACHE_SIZE = int(os.getenv("KNOWN_PROFILES_CACHE_SIZE", "10000"))
+
+# In-process response cache for read endpoints
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+# Recently invalidated tags remembered to reject stale in-flight reads; bounds memory per profile written
+RESPONSE_CACHE_MAX_TRACKED_TAGS = int(os.getenv("RESPONSE_CACHE_MAX_TRACKED_TAGS", "10000"))
+
+# Avatar image processing (process pool)
+AVATAR_WORKERS = int(os.getenv("AVATAR_WORKERS", "2"))
+AVATAR_MAX_PENDING = int(os.getenv("AVATAR_MAX_PENDING", "16"))
+
+# Orphan avatar reclaimer: unreferenced files older than the grace period are deleted
+AVATAR_GC_INTERVAL = float(os.getenv("AVATAR_GC_INTERVAL", "3600"))  # Seconds between sweeps, 0 disables
+AVATAR_GC_GRACE_SECONDS = float(os.getenv("AVATAR_GC_GRACE_SECONDS", "86400"))
+AVATAR_GC_BATCH_SIZE = int(os.getenv("AVATAR_GC_BATCH_SIZE", "500"))
+
+# Response compression (brotli is used when the 'brotli' package is installed)
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))  # Smaller bodies go out as-is
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+# Compressed bodies of ETagged responses, reused until the ETag changes
+COMPRESSION_CACHE_MAX_BYTES = int(os.getenv("COMPRESSION_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+
+# /uploads file serving
+UPLOADS_CACHE_CONTROL = os.getenv("UPLOADS_CACHE_CONTROL", "public, max-age=3600")
+# Files named after their content hash never change
+UPLOADS_IMMUTABLE_CACHE_CONTROL = os.getenv("UPLOADS_IMMUTABLE_CACHE_CONTROL", "public, max-age=31536000, immutable")
+UPLOADS_STAT_CACHE_SIZE = int(os.getenv("UPLOADS_STAT_CACHE_SIZE", "4096"))
+UPLOADS_STAT_CACHE_TTL = float(os.getenv("UPLOADS_STAT_CACHE_TTL", "5"))
+
+# Admin-only endpoints (profile export) require this key in X-Admin-Key; unset disables them
+ADMIN_API_KEY = os.getenv("ADMIN_API_KEY")
+# Profiles per batch (and per import transaction) for NDJSON export/import
+TRANSFER_BATCH_SIZE = int(os.getenv("TRANSFER_BATCH_SIZE", "1000"))
+
 # Database Config
 DATABASE_URL = "sqlite:///./app.db"
+ASYNC_DATABASE_URL = "sqlite+aiosqlite:///./app.db"
+
+# SQLite tuning profile, applied to every new connection ("production" or "off")
+SQLITE_TUNING = os.getenv("SQLITE_TUNING", "production").lower()
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),  # Readers don't block on commits
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),  # Safe with WAL, no fsync per commit
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", "-65536")),  # Negative = KiB, so 64MB per connection
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "temp_store": os.getenv("SQLITE_TEMP_STORE", "MEMORY"),
+} if SQLITE_TUNING == "production" else {}
+
+# Connection pools: many concurrent readers, a single writer (SQLite serializes writes anyway)
+SQLITE_READ_POOL_SIZE = int(os.getenv("SQLITE_READ_POOL_SIZE", "8"))
+SQLITE_READ_MAX_OVERFLOW = int(os.getenv("SQLITE_READ_MAX_OVERFLOW", "8"))
+SQLITE_POOL_TIMEOUT = float(os.getenv("SQLITE_POOL_TIMEOUT", "30"))
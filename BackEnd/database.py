@@ -1,12 +1,69 @@
-from sqlalchemy import create_engine, inspect, text
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
-from config import DATABASE_URL
+from config import (
+    DATABASE_URL,
+    ASYNC_DATABASE_URL,
+    SQLITE_PRAGMAS,
+    SQLITE_READ_POOL_SIZE,
+    SQLITE_READ_MAX_OVERFLOW,
+    SQLITE_POOL_TIMEOUT
+)
 
+def apply_sqlite_pragmas(dbapi_connection, pragmas: dict = SQLITE_PRAGMAS):
+    """Apply the configured tuning PRAGMAs to a raw DB-API connection"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+def _on_connect(dbapi_connection, connection_record):
+    apply_sqlite_pragmas(dbapi_connection)
+
+# Sync engine - used for schema setup and scripts
 engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Async engines - used by the route handlers so queries don't block the event loop.
+# Reads get a pool of connections; writes go through a single connection so concurrent
+# writers queue in-process instead of contending for the SQLite write lock.
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    pool_size=SQLITE_READ_POOL_SIZE,
+    max_overflow=SQLITE_READ_MAX_OVERFLOW,
+    pool_timeout=SQLITE_POOL_TIMEOUT
+)
+async_write_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    pool_size=1,
+    max_overflow=0,
+    pool_timeout=SQLITE_POOL_TIMEOUT
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+AsyncWriteSessionLocal = async_sessionmaker(async_write_engine, autoflush=False, expire_on_commit=False)
+
+for _engine in (engine, async_engine.sync_engine, async_write_engine.sync_engine):
+    event.listen(_engine, "connect", _on_connect)
+
 Base = declarative_base()
 
+# Full-text index over public profile content, one document per profile (see search.py).
+# profile_id is stored but not tokenized; prefix indexes make "term*" queries cheap.
+SEARCH_TABLE_DDL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS profile_search USING fts5(
+    profile_id UNINDEXED,
+    name,
+    services,
+    projects,
+    jobs,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+)
+"""
+
 def get_db():
     db = SessionLocal()
     try:
@@ -14,9 +71,36 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_async_write_db():
+    async with AsyncWriteSessionLocal() as db:
+        yield db
+
+async def dispose_engines():
+    await async_engine.dispose()
+    await async_write_engine.dispose()
+
+# Partial (appear = 1) indexes from an earlier schema: public reads load every child and
+# filter visibility in Python, so the planner never picked them
+RETIRED_INDEXES = ("ix_jobs_public", "ix_social_links_public", "ix_projects_public", "ix_services_public")
+
 def init_db():
     Base.metadata.create_all(bind=engine)
     
+    # create_all skips indexes on tables that already exist, so add any missing ones
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+    
+    # Indexes no query used any more; they only cost writes
+    with engine.connect() as conn:
+        for index_name in RETIRED_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+        conn.commit()
+    
     inspector = inspect(engine)
     existing_columns = [col['name'] for col in inspector.get_columns('profiles')]
     
@@ -29,3 +113,42 @@ def init_db():
         with engine.connect() as conn:
             conn.execute(text("ALTER TABLE profiles ADD COLUMN phone VARCHAR"))
             conn.commit()
+    
+    if 'avatar_variants' not in existing_columns:
+        with engine.connect() as conn:
+            conn.execute(text("ALTER TABLE profiles ADD COLUMN avatar_variants JSON"))
+            conn.commit()
+    
+    if 'avatar_hash' not in existing_columns:
+        with engine.connect() as conn:
+            conn.execute(text("ALTER TABLE profiles ADD COLUMN avatar_hash VARCHAR"))
+            conn.commit()
+    
+    if 'version' not in existing_columns:
+        with engine.connect() as conn:
+            conn.execute(text("ALTER TABLE profiles ADD COLUMN version INTEGER NOT NULL DEFAULT 0"))
+            conn.commit()
+    
+    blob_columns = [col['name'] for col in inspector.get_columns('avatar_blobs')]
+    if 'released_at' not in blob_columns:
+        with engine.connect() as conn:
+            conn.execute(text("ALTER TABLE avatar_blobs ADD COLUMN released_at DATETIME"))
+            conn.commit()
+    
+    snapshot_columns = [col['name'] for col in inspector.get_columns('profile_snapshots')]
+    if 'version' not in snapshot_columns:
+        with engine.connect() as conn:
+            conn.execute(text("ALTER TABLE profile_snapshots ADD COLUMN version INTEGER NOT NULL DEFAULT 0"))
+            conn.commit()
+    
+    if 'profile_search' not in inspector.get_table_names():
+        with engine.connect() as conn:
+            conn.execute(text(SEARCH_TABLE_DDL))
+            conn.commit()
+            if conn.execute(text("SELECT 1 FROM profiles LIMIT 1")).first() is not None:
+                print("⚠️ Warning: Search index created empty - run `python cli.py search rebuild` to index existing profiles")
+    
+    with engine.connect() as conn:
+        summaries_empty = conn.execute(text("SELECT 1 FROM profile_summary LIMIT 1")).first() is None
+        if summaries_empty and conn.execute(text("SELECT 1 FROM profiles LIMIT 1")).first() is not None:
+            print("⚠️ Warning: Profile directory is empty - run `python cli.py directory rebuild` to fill it")
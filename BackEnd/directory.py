@@ -0,0 +1,79 @@
+import unicodedata
+from typing import Optional
+from fastapi import HTTPException, status
+from sqlalchemy import select, delete, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from Models.ProfileSummaryModel import ProfileSummary
+from Schemas.DirectorySchema import ProfileCard
+from response_cache import CachedBody
+from pagination import Cursor, encode_cursor, decode_cursor, NEXT_CURSOR_HEADER
+from fast_json import dump_orm_list
+
+TOP_SERVICES = 3
+CARD_AVATAR_SIZE = "128"
+CARD_AVATAR_FORMAT = "webp"
+
+
+def sort_key(name: str) -> str:
+    """Directory sort key: casefolded with accents stripped, so "Émile" files under E"""
+    decomposed = unicodedata.normalize("NFKD", name.strip())
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def _visible(items: Optional[list[dict]]) -> list[dict]:
+    return [item for item in items or [] if item.get("appear", True)]
+
+
+def summary_row(profile: dict) -> dict:
+    """profile_summary row for a serialized ProfileResponse - counts cover public items only"""
+    services = _visible(profile.get("services"))
+    name = " ".join(filter(None, (profile.get("FirstName"), profile.get("LastName"))))
+    variants = profile.get("avatar_variants") or {}
+    return {
+        "sort_name": sort_key(name),
+        "profile_id": profile["id"],
+        "FirstName": profile.get("FirstName"),
+        "LastName": profile.get("LastName"),
+        "avatar_url": variants.get(CARD_AVATAR_SIZE, {}).get(CARD_AVATAR_FORMAT) or profile.get("avatar_url"),
+        "top_services": [service["title"] for service in services[:TOP_SERVICES]],
+        "service_count": len(services),
+        "project_count": len(_visible(profile.get("projects"))),
+        "job_count": len(_visible(profile.get("jobs"))),
+    }
+
+
+async def refresh_summary(db: AsyncSession, profile_id: str, profile: Optional[dict]):
+    """Replace a profile's directory row, or drop it if the profile is gone - call before commit.
+
+    A rename moves the row's primary key, so this is a delete plus insert rather than an upsert.
+    """
+    await db.execute(delete(ProfileSummary).where(ProfileSummary.profile_id == profile_id))
+    if profile is not None:
+        await db.execute(ProfileSummary.__table__.insert(), summary_row(profile))
+
+
+async def browse_directory(db: AsyncSession, limit: int, cursor: Optional[str] = None) -> CachedBody:
+    """One page of named profiles in name order, keyset-paginated on (sort_name, profile_id)"""
+    order_columns = (ProfileSummary.sort_name, ProfileSummary.profile_id)
+    stmt = select(ProfileSummary)
+    if cursor is None:
+        # Unnamed profiles (sort_name '') sort first and aren't listed
+        stmt = stmt.where(ProfileSummary.sort_name > "")
+    else:
+        # Like search, the directory isn't versioned; pages reflect the table as it is now.
+        # The row-value comparison alone, so SQLite seeks straight to the cursor - which keeps
+        # unnamed profiles out only as long as the cursor is past them, so it must be.
+        position = decode_cursor(cursor, (str, str))
+        if not position.key[0]:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+        stmt = stmt.where(tuple_(*order_columns) > tuple_(*position.key))
+    result = await db.execute(stmt.order_by(*order_columns).limit(limit + 1))
+    rows = result.scalars().all()
+
+    headers = {}
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(Cursor((last.sort_name, last.profile_id), 0))
+
+    return CachedBody(dump_orm_list(ProfileCard, rows), headers)
@@ -0,0 +1,21 @@
+import hashlib
+from typing import Optional
+from fastapi import Response
+
+def profile_etag(profile_id: str, version: int) -> str:
+    """Strong ETag for a profile document. The id is part of it because /api/profile/me
+    serves different profiles from the same URL."""
+    id_hash = hashlib.sha256(profile_id.encode()).hexdigest()[:16]
+    return f'"{id_hash}-{version}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses weak comparison, so W/ prefixes are ignored"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
@@ -0,0 +1,91 @@
+import types
+import typing
+from typing import Any, Callable, Iterable
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+class FastJSONResponse(JSONResponse):
+    """Opt-in response class rendering with orjson instead of json.dumps.
+
+    FastAPI's own ORJSONResponse is deprecated in favour of response-model serialization,
+    which still validates every value; this is for content that needs no validation.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+_serializers: dict[type, Callable[[Any], dict]] = {}
+
+
+def _nested_model(annotation) -> tuple[type[BaseModel] | None, bool]:
+    """Return (model, is_list) if a field annotation is a model or a list of models, e.g. Optional[List[X]]"""
+    origin = typing.get_origin(annotation)
+    if origin in (typing.Union, types.UnionType):
+        for arg in typing.get_args(annotation):
+            if arg is not type(None):
+                return _nested_model(arg)
+        return None, False
+    if origin in (list, typing.List):
+        model, _ = _nested_model(typing.get_args(annotation)[0])
+        return model, model is not None
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+    return None, False
+
+
+def orm_serializer(schema: type[BaseModel]) -> Callable[[Any], dict]:
+    """Build (once per schema) a function turning an ORM object into the schema's dict.
+
+    For trusted ORM output only: values are read straight off the attributes without
+    Pydantic validation, so the result must already match the response model.
+    """
+    serializer = _serializers.get(schema)
+    if serializer is not None:
+        return serializer
+
+    plain = []
+    nested = []
+    for name, field in schema.model_fields.items():
+        model, is_list = _nested_model(field.annotation)
+        default = None if field.is_required() else field.get_default(call_default_factory=True)
+        if model is None:
+            plain.append((name, default))
+        else:
+            nested.append((name, model, is_list, default))
+
+    def serialize(obj) -> dict:
+        data = {name: getattr(obj, name, default) for name, default in plain}
+        for name, model, is_list, default in nested:
+            value = getattr(obj, name, default)
+            if value is None:
+                data[name] = None
+            elif is_list:
+                child = orm_serializer(model)
+                data[name] = [child(item) for item in value]
+            else:
+                data[name] = orm_serializer(model)(value)
+        return data
+
+    _serializers[schema] = serialize
+    return serialize
+
+
+def dump_orm(schema: type[BaseModel], obj) -> bytes:
+    return orjson.dumps(orm_serializer(schema)(obj))
+
+
+def dump_orm_list(schema: type[BaseModel], objs: Iterable) -> bytes:
+    serialize = orm_serializer(schema)
+    return orjson.dumps([serialize(obj) for obj in objs])
+
+
+def orm_response(schema: type[BaseModel], obj, **kwargs) -> FastJSONResponse:
+    """Serialize a trusted ORM object with orjson, bypassing response_model validation"""
+    return FastJSONResponse(content=orm_serializer(schema)(obj), **kwargs)
+
+
+def orm_list_response(schema: type[BaseModel], objs: Iterable, **kwargs) -> FastJSONResponse:
+    serialize = orm_serializer(schema)
+    return FastJSONResponse(content=[serialize(obj) for obj in objs], **kwargs)
@@ -0,0 +1,107 @@
+import asyncio
+import time
+from typing import Optional
+import httpx
+from http_client import get_http_client
+from config import JWKS_TTL_SECONDS, JWKS_MIN_REFRESH_INTERVAL
+
+
+class JWKSKeyStore:
+    """Auth0 signing keys indexed by kid, refreshed in the background.
+
+    Keys are served from memory. An unknown kid triggers at most one refetch per
+    `min_refresh_interval`, so forged tokens can't cause a fetch storm, and the last
+    good key set keeps being served if Auth0 is unreachable.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        ttl: float = JWKS_TTL_SECONDS,
+        min_refresh_interval: float = JWKS_MIN_REFRESH_INTERVAL,
+        client: Optional[httpx.AsyncClient] = None
+    ):
+        self.url = url
+        self.ttl = ttl
+        self.min_refresh_interval = min_refresh_interval
+        self._client = client
+        self._keys: dict[str, dict] = {}
+        self._last_attempt = 0.0
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        return self._client if self._client is not None else get_http_client()
+
+    async def get_key(self, kid: Optional[str]) -> Optional[dict]:
+        """Return the RSA key for `kid`, refetching once if it's unknown (keys may have rotated)"""
+        if not kid:
+            return None
+
+        key = self._keys.get(kid)
+        if key is not None:
+            return key
+
+        await self.refresh(force=False)
+        return self._keys.get(kid)
+
+    async def refresh(self, force: bool = True) -> bool:
+        """Fetch the JWKS and swap in the new key index. Returns True if the keys were updated."""
+        async with self._lock:
+            now = time.monotonic()
+            # Concurrent callers that queued behind a fetch reuse its result
+            if not force and now - self._last_attempt < self.min_refresh_interval:
+                return False
+            self._last_attempt = now
+
+            try:
+                response = await self._get_client().get(self.url)
+                response.raise_for_status()
+                jwks = response.json()
+            except (httpx.HTTPError, ValueError) as e:
+                # Keep serving the stale keys
+                print(f"⚠️ Warning: Could not refresh JWKS: {e}")
+                return False
+
+            keys = {}
+            for key in jwks.get("keys", []):
+                if not key.get("kid") or key.get("kty") != "RSA":
+                    continue
+                keys[key["kid"]] = {
+                    "kty": key["kty"],
+                    "kid": key["kid"],
+                    "use": key.get("use", "sig"),
+                    "n": key["n"],
+                    "e": key["e"]
+                }
+
+            if not keys:
+                print("⚠️ Warning: JWKS response contained no RSA keys")
+                return False
+
+            self._keys = keys
+            return True
+
+    async def _refresh_loop(self):
+        while True:
+            # Retry sooner while we have nothing to serve
+            await asyncio.sleep(self.ttl if self._keys else self.min_refresh_interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"⚠️ Warning: JWKS refresh loop error: {e}")
+
+    async def start(self):
+        """Load the keys and start the background refresh task"""
+        await self.refresh()
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
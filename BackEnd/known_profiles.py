@@ -0,0 +1,44 @@
+from collections import OrderedDict
+from config import KNOWN_PROFILES_CACHE_SIZE
+
+
+class KnownProfiles:
+    """Bounded LRU of user ids whose profile is known to exist.
+
+    Lets /api/profile/me skip the existence check and the create path for returning
+    users. A stale entry (profile deleted by another process) only costs a fallback to
+    the create path, so entries don't expire.
+    """
+
+    def __init__(self, maxsize: int = KNOWN_PROFILES_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._ids: "OrderedDict[str, None]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, user_id: str) -> bool:
+        if user_id in self._ids:
+            self._ids.move_to_end(user_id)
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def add(self, user_id: str):
+        self._ids[user_id] = None
+        self._ids.move_to_end(user_id)
+        while len(self._ids) > self.maxsize:
+            self._ids.popitem(last=False)
+
+    def discard(self, user_id: str):
+        self._ids.pop(user_id, None)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._ids),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0
+        }
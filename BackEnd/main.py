@@ -1,13 +1,19 @@
 from fastapi import FastAPI, Request, status, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
-from fastapi.staticfiles import StaticFiles
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import SQLAlchemyError
 from pathlib import Path
-from database import init_db
-from Routes import auth, profiles, services, social_links, projects, jobs
+from contextlib import asynccontextmanager
+from database import init_db, dispose_engines
+from auth import jwks_store
+from http_client import start_http_client, close_http_client
+from avatar_processing import shutdown_executor
+from avatar_gc import avatar_reclaimer
+from static_files import UploadsFiles
+from compression import CompressionMiddleware
+from Routes import auth, profiles, services, social_links, projects, jobs, metrics, search, directory, admin
 import traceback
 
 # Initialize database
@@ -17,11 +23,26 @@ init_db()
 UPLOAD_DIR = Path("uploads/avatars")
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await start_http_client()
+    await jwks_store.start()
+    await avatar_reclaimer.start()
+    yield
+    await avatar_reclaimer.stop()
+    await jwks_store.stop()
+    await close_http_client()
+    await dispose_engines()
+    shutdown_executor()
+
 # Create FastAPI app with redirect_slashes=False
-app = FastAPI(redirect_slashes=False)
+app = FastAPI(redirect_slashes=False, lifespan=lifespan)
+
+# Serve static files (avatars); uploads/tmp holds partial uploads and is never served
+app.mount("/uploads", UploadsFiles(directory="uploads", exclude=("tmp",)), name="uploads")
 
-# Serve static files (avatars)
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+# Compress JSON responses; /uploads serves images and its own precompressed files
+app.add_middleware(CompressionMiddleware, exclude_paths=("/uploads",))
 
 # CORS - Important for cookies
 app.add_middleware(
@@ -30,7 +51,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["*"],
+    expose_headers=["*", "X-Next-Cursor"],  # "*" isn't honoured for credentialed requests
 )
 
 # ========== ERROR HANDLERS ==========
@@ -124,6 +145,12 @@ def custom_openapi():
             "scheme": "bearer",
             "bearerFormat": "JWT",
             "description": "Bearer token authentication (for Swagger testing). Enter token without 'Bearer' prefix."
+        },
+        "adminKey": {
+            "type": "apiKey",
+            "in": "header",
+            "name": "X-Admin-Key",
+            "description": "ADMIN_API_KEY, for admin-only endpoints"
         }
     }
     
@@ -154,6 +181,10 @@ app.include_router(services.router)
 app.include_router(social_links.router)
 app.include_router(projects.router)
 app.include_router(jobs.router)
+app.include_router(metrics.router)
+app.include_router(search.router)
+app.include_router(directory.router)
+app.include_router(admin.router)
 
 @app.get("/")
 def read_root():
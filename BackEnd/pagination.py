@@ -0,0 +1,130 @@
+import base64
+import json
+import orjson
+from typing import NamedTuple, Optional
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from response_cache import CachedBody
+from snapshots import get_profile_version
+from fast_json import dump_orm_list
+
+MAX_PAGE_SIZE = 100
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+SQLITE_MIN_INT, SQLITE_MAX_INT = -2**63, 2**63 - 1
+
+
+class Cursor(NamedTuple):
+    """Position after the last item of a page, plus the profile version the page was read at"""
+    key: tuple
+    version: int
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    raw = json.dumps([list(cursor.key), cursor.version], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _is_a(value, expected: type) -> bool:
+    # JSON can't tell 1.0 from 1, and bool is an int subclass that must not pass as one
+    if isinstance(value, bool):
+        return False
+    if expected is float:
+        return isinstance(value, (int, float))
+    if expected is int:
+        # Anything wider than SQLite's INTEGER would fail to bind
+        return isinstance(value, int) and SQLITE_MIN_INT <= value <= SQLITE_MAX_INT
+    return isinstance(value, expected)
+
+
+def decode_cursor(value: str, key_types: tuple[type, ...]) -> Cursor:
+    """Decode a cursor whose key must hold one value of each of `key_types`; 400 otherwise"""
+    try:
+        raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+        key, version = json.loads(raw)
+        if (
+            not isinstance(key, list) or len(key) != len(key_types)
+            or not all(_is_a(part, expected) for part, expected in zip(key, key_types))
+            or not _is_a(version, int)
+        ):
+            raise ValueError("cursor shape mismatch")
+        return Cursor(tuple(key), version)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def parse_fields(fields: Optional[str], schema: type[BaseModel]) -> Optional[list[str]]:
+    """Parse a comma-separated `fields=` projection, keeping only response-model fields"""
+    if not fields:
+        return None
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in schema.model_fields]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}. Allowed fields: {', '.join(schema.model_fields)}"
+        )
+    return list(dict.fromkeys(requested))
+
+
+async def list_page(
+    db: AsyncSession,
+    model,
+    schema: type[BaseModel],
+    profile_id: str,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None
+) -> CachedBody:
+    """List a profile's items in (sort_order, id) order - or id order for unsorted models.
+
+    With `limit`, returns one page and sets X-Next-Cursor when there are more. Cursors carry
+    the profile version, so paging across a write (e.g. a reorder) gets a 409 instead of
+    silently skipping or repeating items. The version covers the whole profile, so by design
+    a write to any of its lists or fields expires the cursor: checking it is one primary-key
+    read, where fingerprinting just this list would cost a scan of it on every page. With
+    `fields`, only those columns are selected and no ORM objects are built.
+    """
+    order_columns = [model.sort_order, model.id] if hasattr(model, "sort_order") else [model.id]
+    projection = parse_fields(fields, schema)
+
+    version = None
+    if limit is not None or cursor is not None:
+        version = await get_profile_version(db, profile_id) or 0
+
+    if projection:
+        extra = [column for column in order_columns if column.key not in projection]
+        stmt = select(*[getattr(model, field) for field in projection], *extra)
+    else:
+        stmt = select(model)
+    stmt = stmt.where(model.profile_id == profile_id).order_by(*order_columns)
+
+    if cursor is not None:
+        position = decode_cursor(cursor, tuple(column.type.python_type for column in order_columns))
+        if position.version != version:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="The list changed since this cursor was issued. Restart from the first page."
+            )
+        stmt = stmt.where(tuple_(*order_columns) > tuple_(*position.key))
+
+    if limit is not None:
+        stmt = stmt.limit(limit + 1)
+
+    result = await db.execute(stmt)
+    rows = result.all() if projection else result.scalars().all()
+
+    headers = {}
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        key = tuple(getattr(last, column.key) for column in order_columns)
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(Cursor(key, version))
+
+    if projection:
+        body = orjson.dumps([{field: getattr(row, field) for field in projection} for row in rows])
+    else:
+        body = dump_orm_list(schema, rows)
+
+    return CachedBody(body, headers)
@@ -0,0 +1,42 @@
+import orjson
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from Models.ProfileModel import Profile
+from snapshots import refresh_snapshot
+from search import index_profile
+from directory import refresh_summary
+from response_cache import response_cache, profile_tag
+
+# Session.info key collecting the profiles changed in the current transaction
+CHANGED_PROFILES = "changed_profiles"
+
+async def profile_changed(db: AsyncSession, profile_id: str):
+    """Call before committing any write to a profile or its children.
+
+    Bumps the profile's version (its ETag), rebuilds its snapshot, search document and
+    directory summary in the same transaction and queues the in-process caches for
+    invalidation once the transaction commits.
+    """
+    # Sessions don't autoflush, so a just-added profile must be INSERTed before its version is bumped
+    await db.flush()
+    await db.execute(
+        update(Profile)
+        .where(Profile.id == profile_id)
+        .values(version=Profile.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    snapshot = await refresh_snapshot(db, profile_id)
+    profile = orjson.loads(snapshot.payload) if snapshot else None
+    await index_profile(db, profile_id, profile)
+    await refresh_summary(db, profile_id, profile)
+    db.info.setdefault(CHANGED_PROFILES, set()).add(profile_id)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_caches(session: Session):
+    for profile_id in session.info.pop(CHANGED_PROFILES, ()):
+        response_cache.invalidate_tag(profile_tag(profile_id))
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session):
+    session.info.pop(CHANGED_PROFILES, None)
@@ -0,0 +1,147 @@
+import hashlib
+from collections import OrderedDict
+from typing import Awaitable, Callable, NamedTuple, Optional
+from urllib.parse import urlencode
+from fastapi import Request, Response
+from config import RESPONSE_CACHE_MAX_BYTES, RESPONSE_CACHE_MAX_TRACKED_TAGS
+from etags import etag_matches
+
+
+class CachedBody(NamedTuple):
+    body: bytes
+    headers: dict[str, str]  # No default: a shared {} would be mutated across responses
+
+
+def profile_tag(profile_id: str) -> str:
+    return f"profile:{profile_id}"
+
+
+class ResponseCache:
+    """In-process cache of serialized GET responses with an LRU memory budget.
+
+    Entries are keyed by route path plus query string and tagged (e.g. by profile_id),
+    so writes can drop every cached response that depends on a profile in one call.
+    """
+
+    def __init__(self, max_bytes: int = RESPONSE_CACHE_MAX_BYTES, max_tracked_tags: int = RESPONSE_CACHE_MAX_TRACKED_TAGS):
+        self.max_bytes = max_bytes
+        self.max_tracked_tags = max_tracked_tags
+        self._entries: "OrderedDict[str, tuple[CachedBody, tuple[str, ...]]]" = OrderedDict()
+        self._tags: dict[str, set[str]] = {}
+        # Invalidation clock, so a read that started before a write can't store stale data.
+        # Only the most recently invalidated tags are remembered; older ones count as
+        # invalidated at `_floor`, which at worst skips caching a read that overlapped the prune.
+        self._clock = 0
+        self._invalidated: "OrderedDict[str, int]" = OrderedDict()
+        self._floor = 0
+        self._size = 0
+        self._route_stats: dict[str, dict] = {}
+
+    @staticmethod
+    def key_for(request: Request) -> str:
+        # Re-encoded, so a value containing "&" or "=" can't collide with separate params
+        query = urlencode(sorted(request.query_params.multi_items()))
+        return f"{request.url.path}?{query}"
+
+    @staticmethod
+    def _entry_size(key: str, cached: CachedBody) -> int:
+        return len(cached.body) + len(key) + sum(len(k) + len(v) for k, v in cached.headers.items())
+
+    def _record(self, route: str, hit: bool):
+        stats = self._route_stats.setdefault(route, {"hits": 0, "misses": 0})
+        stats["hits" if hit else "misses"] += 1
+
+    def generation(self) -> int:
+        """Token to take before building a response and pass to set()"""
+        return self._clock
+
+    def get(self, route: str, key: str) -> Optional[CachedBody]:
+        entry = self._entries.get(key)
+        self._record(route, entry is not None)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def set(self, key: str, cached: CachedBody, tags: tuple[str, ...], generation: Optional[int] = None):
+        if generation is not None and any(self._invalidated.get(tag, self._floor) > generation for tag in tags):
+            return
+        size = self._entry_size(key, cached)
+        if size > self.max_bytes:
+            return
+
+        self._remove(key)
+        self._entries[key] = (cached, tags)
+        self._size += size
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+
+        while self._size > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        cached, tags = entry
+        self._size -= self._entry_size(key, cached)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def invalidate_tag(self, tag: str):
+        self._clock += 1
+        self._invalidated[tag] = self._clock
+        self._invalidated.move_to_end(tag)
+        while len(self._invalidated) > self.max_tracked_tags:
+            _, invalidated_at = self._invalidated.popitem(last=False)
+            self._floor = max(self._floor, invalidated_at)
+        for key in list(self._tags.get(tag, ())):
+            self._remove(key)
+
+    def clear(self):
+        self._entries.clear()
+        self._tags.clear()
+        self._size = 0
+
+    def stats(self) -> dict:
+        routes = {}
+        for route, stats in self._route_stats.items():
+            lookups = stats["hits"] + stats["misses"]
+            routes[route] = {**stats, "hit_ratio": stats["hits"] / lookups if lookups else 0.0}
+        return {
+            "entries": len(self._entries),
+            "bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "routes": routes
+        }
+
+
+response_cache = ResponseCache()
+
+
+async def cached_response(
+    request: Request,
+    tags: tuple[str, ...],
+    build: Callable[[], Awaitable[CachedBody]]
+) -> Response:
+    """Return the cached JSON body for this request, or build, cache and return it"""
+    route = request.scope["route"].path if "route" in request.scope else request.url.path
+    key = response_cache.key_for(request)
+
+    cached = response_cache.get(route, key)
+    if cached is None:
+        generation = response_cache.generation()
+        cached = await build()
+        # Content hash as a strong validator; also lets the compression layer reuse its output
+        etag = f'"{hashlib.blake2b(cached.body, digest_size=12).hexdigest()}"'
+        cached = CachedBody(cached.body, {**cached.headers, "ETag": etag})
+        response_cache.set(key, cached, tags, generation)
+
+    if etag_matches(request.headers.get("if-none-match"), cached.headers["ETag"]):
+        return Response(status_code=304, headers=cached.headers)
+    return Response(content=cached.body, media_type="application/json", headers=cached.headers)
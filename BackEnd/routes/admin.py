@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from auth import require_admin_key
+from database import AsyncSessionLocal
+from transfer import export_profiles
+
+router = APIRouter()
+
+@router.get("/api/admin/export", tags=["Admin"], dependencies=[Depends(require_admin_key)])
+async def export_all_profiles():
+    """Stream every profile with its children as NDJSON (one profile per line) - requires X-Admin-Key"""
+    async def stream():
+        # The session lives as long as the stream, not the request handler
+        async with AsyncSessionLocal() as db:
+            async for chunk in export_profiles(db):
+                yield chunk
+
+    return StreamingResponse(
+        stream(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="profiles.ndjson"', "Cache-Control": "no-store"}
+    )
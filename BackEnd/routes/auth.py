@@ -2,14 +2,42 @@ from fastapi import APIRouter, HTTPException, Request, Response, Depends, Query,
 from fastapi.security import HTTPAuthorizationCredentials
 from fastapi.responses import RedirectResponse
 from Schemas.TokenSchema import TokenRequest
-from auth import verify_token, get_token_data, security, get_or_create_profile
-from config import AUTH0_DOMAIN, AUTH0_CLIENT_ID, AUTH0_CLIENT_SECRET
-from database import get_db
+from auth import verify_token, get_token_data, security, ensure_profile
+from config import AUTH0_DOMAIN, AUTH0_CLIENT_ID, AUTH0_CLIENT_SECRET, REFRESH_RESULT_TTL
+from database import AsyncSessionLocal
+from http_client import get_http_client
+from singleflight import SingleFlight
+import hashlib
 import httpx
 from typing import Optional
 
 router = APIRouter()
 
+# One Auth0 round trip per refresh token, shared by concurrent /api/auth/refresh calls
+refresh_flight = SingleFlight(
+    result_ttl=REFRESH_RESULT_TTL,
+    should_cache=lambda result: result[0] == 200
+)
+
+async def request_refreshed_tokens(refresh_token: str) -> tuple[int, dict]:
+    """Exchange a refresh token at Auth0. Returns (status_code, response data)."""
+    client = get_http_client()
+    token_response = await client.post(
+        f"https://{AUTH0_DOMAIN}/oauth/token",
+        json={
+            "grant_type": "refresh_token",
+            "client_id": AUTH0_CLIENT_ID,
+            "client_secret": AUTH0_CLIENT_SECRET,
+            "refresh_token": refresh_token
+        }
+    )
+    
+    if token_response.status_code == 200:
+        return token_response.status_code, token_response.json()
+    
+    error_data = token_response.json() if token_response.headers.get("content-type", "").startswith("application/json") else {}
+    return token_response.status_code, error_data
+
 @router.get("/api/auth/callback", tags=["Auth"])
 async def auth_callback(
     code: str = Query(...)
@@ -24,18 +52,17 @@ async def auth_callback(
     try:
         token_url = f"https://{AUTH0_DOMAIN}/oauth/token"
         
-        async with httpx.AsyncClient() as client:
-            token_response = await client.post(
-                token_url,
-                json={
-                    "grant_type": "authorization_code",
-                    "client_id": AUTH0_CLIENT_ID,
-                    "client_secret": AUTH0_CLIENT_SECRET,
-                    "code": code,
-                    "redirect_uri": "http://localhost:8000/api/auth/callback"
-                },
-                timeout=10.0
-            )
+        client = get_http_client()
+        token_response = await client.post(
+            token_url,
+            json={
+                "grant_type": "authorization_code",
+                "client_id": AUTH0_CLIENT_ID,
+                "client_secret": AUTH0_CLIENT_SECRET,
+                "code": code,
+                "redirect_uri": "http://localhost:8000/api/auth/callback"
+            }
+        )
         
         if token_response.status_code != 200:
             error_data = token_response.json() if token_response.headers.get("content-type", "").startswith("application/json") else {}
@@ -57,12 +84,10 @@ async def auth_callback(
         
         userinfo_url = f"https://{AUTH0_DOMAIN}/userinfo"
         try:
-            async with httpx.AsyncClient() as client:
-                userinfo_response = await client.get(
-                    userinfo_url,
-                    headers={"Authorization": f"Bearer {access_token}"},
-                    timeout=10.0
-                )
+            userinfo_response = await client.get(
+                userinfo_url,
+                headers={"Authorization": f"Bearer {access_token}"}
+            )
             
             if userinfo_response.status_code != 200:
                 verified_token = await verify_token(credentials=HTTPAuthorizationCredentials(
@@ -79,14 +104,12 @@ async def auth_callback(
             ))
             user_data = verified_token
         
-        db = next(get_db())
-        try:
-            profile = get_or_create_profile(user_data, db)
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-        finally:
-            db.close()
+        async with AsyncSessionLocal() as db:
+            try:
+                await ensure_profile(user_data, db)
+            except Exception as e:
+                import traceback
+                traceback.print_exc()
         
         redirect_response = RedirectResponse(url="http://localhost:5173/")
         redirect_response.set_cookie(
@@ -220,22 +243,13 @@ async def refresh_token(request: Request, response: Response):
         )
     
     try:
-        token_url = f"https://{AUTH0_DOMAIN}/oauth/token"
-        
-        async with httpx.AsyncClient() as client:
-            token_response = await client.post(
-                token_url,
-                json={
-                    "grant_type": "refresh_token",
-                    "client_id": AUTH0_CLIENT_ID,
-                    "client_secret": AUTH0_CLIENT_SECRET,
-                    "refresh_token": refresh_token
-                },
-                timeout=10.0
-            )
+        status_code, token_data = await refresh_flight.do(
+            hashlib.sha256(refresh_token.encode()).hexdigest(),
+            lambda: request_refreshed_tokens(refresh_token)
+        )
         
-        if token_response.status_code != 200:
-            error_data = token_response.json() if token_response.headers.get("content-type", "").startswith("application/json") else {}
+        if status_code != 200:
+            error_data = token_data
             error_message = error_data.get("error_description", "Failed to refresh token")
             error_code = error_data.get("error", "unknown_error")
             
@@ -262,7 +276,6 @@ async def refresh_token(request: Request, response: Response):
                 detail=f"Token refresh failed: {error_message}"
             )
         
-        token_data = token_response.json()
         new_access_token = token_data.get("access_token")
         new_refresh_token = token_data.get("refresh_token") 
         
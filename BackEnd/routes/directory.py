@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from database import get_async_db
+from Schemas.DirectorySchema import ProfileCard
+from directory import browse_directory
+from pagination import MAX_PAGE_SIZE
+
+router = APIRouter()
+
+@router.get("/api/directory", response_model=List[ProfileCard], tags=["Directory"])
+async def get_directory(
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Browse profile cards in name order - public endpoint"""
+    page = await browse_directory(db, limit, cursor)
+    return Response(content=page.body, media_type="application/json", headers=page.headers)
@@ -1,26 +1,37 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
-from sqlalchemy.orm import Session
-from typing import List
-from database import get_db
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from database import get_async_db, get_async_write_db
 from Models.JobModel import Job
-from Schemas.JobSchema import JobsCreate, JobsResponse
+from Schemas.JobSchema import JobsCreate, JobsResponse, JobsBulkRequest
+from Schemas.BulkSchema import BulkResponse
 from auth import get_token_data, get_user_id_from_token
+from profile_events import profile_changed
+from response_cache import cached_response, profile_tag
+from pagination import list_page, MAX_PAGE_SIZE
+from bulk import apply_bulk
 
 router = APIRouter()
 
 @router.get("/api/jobs", response_model=List[JobsResponse], tags=["Jobs"])
 async def get_jobs(
+    request: Request,
     profile_id: str = Query(..., description="Profile ID to get jobs for"),
-    db: Session = Depends(get_db),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; omit to get the full list"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,title"),
+    db: AsyncSession = Depends(get_async_db),
     token_data: dict = Depends(get_token_data)
 ):
-    jobs = db.query(Job).filter(Job.profile_id == profile_id).all()
-    return jobs
+    async def build():
+        return await list_page(db, Job, JobsResponse, profile_id, limit, cursor, fields)
+    
+    return await cached_response(request, (profile_tag(profile_id),), build)
 
 @router.post("/api/jobs", response_model=JobsResponse, tags=["Jobs"])
 async def create_job(
     job: JobsCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_write_db),
     token_data: dict = Depends(get_token_data)
 ):
     user_id = get_user_id_from_token(token_data)
@@ -31,17 +42,18 @@ async def create_job(
         description=job.description
     )
     db.add(db_job)
-    db.commit()
-    db.refresh(db_job)
+    await profile_changed(db, user_id)
+    await db.commit()
+    await db.refresh(db_job)
     return db_job
 
 
 @router.get("/api/jobs/{job_id}", response_model=JobsResponse, tags=["Jobs"])
 async def get_job_by_id(
     job_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    db_job = db.query(Job).filter(Job.id == job_id).first()
+    db_job = await db.get(Job, job_id)
     if not db_job:
         raise HTTPException(status_code=404, detail="Job not found")
     return db_job
@@ -50,30 +62,50 @@ async def get_job_by_id(
 async def update_job(
     job_id: int,
     job: JobsCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_write_db),
     token_data: dict = Depends(get_token_data)
 ):
-    db_job = db.query(Job).filter(Job.id == job_id).first()
+    db_job = await db.get(Job, job_id)
     if not db_job:
         raise HTTPException(status_code=404, detail="Job not found")
     
     db_job.title = job.title
     db_job.description = job.description
     
-    db.commit()
-    db.refresh(db_job)
+    await profile_changed(db, db_job.profile_id)
+    await db.commit()
+    await db.refresh(db_job)
     return db_job
 
 @router.delete("/api/jobs/{job_id}", tags=["Jobs"])
 async def delete_job(
     job_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_write_db),
     token_data: dict = Depends(get_token_data)
 ):
-    db_job = db.query(Job).filter(Job.id == job_id).first()
+    db_job = await db.get(Job, job_id)
     if not db_job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    db.delete(db_job)
-    db.commit()
+    await db.delete(db_job)
+    await profile_changed(db, db_job.profile_id)
+    await db.commit()
     return {"message": "Job deleted"}
+
+# Fields a create/update sets - same as the single-item endpoints above
+BULK_FIELDS = ("title", "description")
+
+@router.post("/api/jobs/bulk", response_model=BulkResponse, tags=["Jobs"])
+async def bulk_jobs(
+    bulk_request: JobsBulkRequest,
+    db: AsyncSession = Depends(get_async_write_db),
+    token_data: dict = Depends(get_token_data)
+):
+    """Apply many creates, updates and deletes in one transaction"""
+    user_id = get_user_id_from_token(token_data)
+    
+    outcome = await apply_bulk(db, Job, user_id, bulk_request, BULK_FIELDS)
+    if outcome.written:
+        await profile_changed(db, user_id)
+        await db.commit()
+    return {"results": outcome.results}
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends
+from auth import get_token_data, token_cache, known_profiles
+from response_cache import response_cache
+from avatar_gc import avatar_reclaimer
+from compression import compressed_body_cache
+
+router = APIRouter()
+
+@router.get("/api/metrics/cache", tags=["Metrics"])
+async def get_cache_metrics(token_data: dict = Depends(get_token_data)):
+    """Hit/miss counters for the in-process caches"""
+    return {
+        "responses": response_cache.stats(),
+        "verified_tokens": token_cache.stats(),
+        "known_profiles": known_profiles.stats(),
+        "compressed_bodies": compressed_body_cache.stats()
+    }
+
+@router.get("/api/metrics/avatar-gc", tags=["Metrics"])
+async def get_avatar_gc_metrics(token_data: dict = Depends(get_token_data)):
+    """Files and bytes reclaimed by the orphan avatar collector"""
+    return avatar_reclaimer.stats()
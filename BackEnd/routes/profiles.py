@@ -1,30 +1,68 @@
-from fastapi import APIRouter, HTTPException, Depends, File, UploadFile, status
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, HTTPException, Depends, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from pathlib import Path
-import shutil
-import uuid
-import os
-from database import get_db
+from starlette.concurrency import run_in_threadpool
+import orjson
+from database import get_async_db, get_async_write_db, AsyncWriteSessionLocal
 from Models.ProfileModel import Profile
-from Schemas.ProfileSchema import ProfileCreate, ProfileResponse
-from auth import get_token_data, get_user_id_from_token, get_user_email_from_token, get_or_create_profile
+from Schemas.ProfileSchema import ProfileCreate, ProfileResponse, ProfileBatchRequest, ProfileBatchResponse
+from auth import get_token_data, get_user_id_from_token, get_user_email_from_token, ensure_profile, known_profiles
+from snapshots import load_profile, get_or_build_snapshot, get_or_build_snapshots, get_profile_version
+from etags import profile_etag, etag_matches, not_modified
+from profile_events import profile_changed
+from fast_json import orm_response
+from avatar_storage import (
+    UploadTooLarge, InvalidUpload, stream_upload, sniff_image_type, move_into_place, discard,
+    blob_path, avatar_url_for, variant_urls
+)
+from avatar_blobs import find_blob, acquire_blob, release_blob
+from avatar_processing import AvatarProcessingError, generate_variants
 
 router = APIRouter()
 
 # Allowed image extensions
 ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
+MAX_BATCH_PROFILES = 100
+
+# Clients may keep profile documents but must revalidate them (cheaply, via ETag)
+PUBLIC_PROFILE_CACHE_CONTROL = "public, no-cache"
+PRIVATE_PROFILE_CACHE_CONTROL = "private, no-cache"
 
 # IMPORTANT: More specific routes must come FIRST
 @router.get("/api/profile/me", response_model=ProfileResponse, tags=["Profiles"])
 async def get_my_profile(
+    request: Request,
     token_data: dict = Depends(get_token_data),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get current user's profile - auto-creates if doesn't exist"""
     try:
-        profile = get_or_create_profile(token_data, db)
-        return profile
+        user_id = await ensure_profile(token_data, db)
+        
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            version = await get_profile_version(db, user_id)
+            if version is not None:
+                etag = profile_etag(user_id, version)
+                if etag_matches(if_none_match, etag):
+                    return not_modified(etag, PRIVATE_PROFILE_CACHE_CONTROL)
+        
+        snapshot = await get_or_build_snapshot(db, user_id)
+        if snapshot is None:
+            # Deleted since we cached the id (e.g. by another worker) - recreate it
+            known_profiles.discard(user_id)
+            user_id = await ensure_profile(token_data, db)
+            snapshot = await get_or_build_snapshot(db, user_id)
+        
+        return Response(
+            content=snapshot.payload,
+            media_type="application/json",
+            headers={
+                "ETag": profile_etag(user_id, snapshot.version),
+                "Cache-Control": PRIVATE_PROFILE_CACHE_CONTROL
+            }
+        )
         
     except ValueError as e:
         raise HTTPException(
@@ -37,32 +75,72 @@ async def get_my_profile(
             detail=f"Failed to get profile: {str(e)}"
         )
 
+@router.post("/api/profile/batch", response_model=ProfileBatchResponse, tags=["Profiles"])
+async def get_profiles_batch(
+    batch: ProfileBatchRequest,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get many public profiles in one request, in the order requested. Unknown ids come back as null and are listed in `missing`."""
+    if len(batch.ids) > MAX_BATCH_PROFILES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many ids. A batch request may contain at most {MAX_BATCH_PROFILES} profiles."
+        )
+    profile_ids = list(dict.fromkeys(batch.ids))
+    
+    try:
+        snapshots = await get_or_build_snapshots(db, profile_ids)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get profiles: {str(e)}"
+        )
+    
+    # Splice the stored JSON documents together instead of parsing and re-serializing them
+    payloads = [snapshots[profile_id].payload if profile_id in snapshots else b"null" for profile_id in batch.ids]
+    missing = [profile_id for profile_id in profile_ids if profile_id not in snapshots]
+    body = b'{"profiles":[' + b",".join(payloads) + b'],"missing":' + orjson.dumps(missing) + b"}"
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"Cache-Control": PUBLIC_PROFILE_CACHE_CONTROL}
+    )
+
 # Then the parameterized route
 @router.get("/api/profile/{profile_id}", response_model=ProfileResponse, tags=["Profiles"])
 async def get_profile(
     profile_id: str,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get profile by ID - public endpoint, no authentication required. Returns profile with all related data."""
     try:
-        # Use joinedload to eagerly load all relationships
-        profile = db.query(Profile)\
-            .options(
-                joinedload(Profile.jobs),
-                joinedload(Profile.services),
-                joinedload(Profile.projects),
-                joinedload(Profile.social_links)
-            )\
-            .filter(Profile.id == profile_id)\
-            .first()
+        # Conditional GET: answer from the version alone, without touching the children
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            version = await get_profile_version(db, profile_id)
+            if version is not None:
+                etag = profile_etag(profile_id, version)
+                if etag_matches(if_none_match, etag):
+                    return not_modified(etag, PUBLIC_PROFILE_CACHE_CONTROL)
+        
+        # Served from the materialized snapshot - one key lookup, no ORM load or validation
+        snapshot = await get_or_build_snapshot(db, profile_id)
         
-        if not profile:
+        if snapshot is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Profile with ID '{profile_id}' not found"
             )
         
-        return profile
+        return Response(
+            content=snapshot.payload,
+            media_type="application/json",
+            headers={
+                "ETag": profile_etag(profile_id, snapshot.version),
+                "Cache-Control": PUBLIC_PROFILE_CACHE_CONTROL
+            }
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -73,7 +151,7 @@ async def get_profile(
 
 @router.get("/api/profile", tags=["Profiles"])
 async def get_profile_root(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     token_data: dict = Depends(get_token_data)
 ):
     """Redirect to /api/profile/me - handles trailing slash redirects"""
@@ -83,14 +161,14 @@ async def get_profile_root(
 @router.post("/api/profile", response_model=ProfileResponse, tags=["Profiles"])
 async def create_profile(
     profile: ProfileCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_write_db),
     token_data: dict = Depends(get_token_data)
 ):
     try:
         user_id = get_user_id_from_token(token_data)
         
         # Check if profile already exists
-        existing = db.query(Profile).filter(Profile.id == user_id).first()
+        existing = await db.get(Profile, user_id)
         if existing:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -107,13 +185,13 @@ async def create_profile(
             phone=profile.phone
         )
         db.add(db_profile)
-        db.commit()
-        db.refresh(db_profile)
-        return db_profile
+        await profile_changed(db, user_id)
+        await db.commit()
+        return orm_response(ProfileResponse, await load_profile(db, user_id))
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create profile: {str(e)}"
@@ -123,7 +201,7 @@ async def create_profile(
 async def update_profile(
     profile_id: str,
     profile: ProfileCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_write_db),
     token_data: dict = Depends(get_token_data)
 ):
     try:
@@ -134,7 +212,7 @@ async def update_profile(
                 detail="You are not authorized to update this profile"
             )
         
-        db_profile = db.query(Profile).filter(Profile.id == profile_id).first()
+        db_profile = await db.get(Profile, profile_id)
         if not db_profile:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -143,17 +221,22 @@ async def update_profile(
         
         db_profile.FirstName = profile.FirstName
         db_profile.LastName = profile.LastName
+        if profile.avatar_url != db_profile.avatar_url:
+            # Variants were generated for the old image
+            db_profile.avatar_variants = None
+            await release_blob(db, db_profile.avatar_hash)
+            db_profile.avatar_hash = None
         db_profile.avatar_url = profile.avatar_url
         db_profile.phone = profile.phone
         db_profile.email = profile.email  # Add this line to update the email
         
-        db.commit()
-        db.refresh(db_profile)
-        return db_profile
+        await profile_changed(db, profile_id)
+        await db.commit()
+        return orm_response(ProfileResponse, await load_profile(db, profile_id))
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to update profile: {str(e)}"
@@ -162,7 +245,7 @@ async def update_profile(
 @router.delete("/api/profile/{profile_id}", tags=["Profiles"])
 async def delete_profile(
     profile_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_write_db),
     token_data: dict = Depends(get_token_data)
 ):
     """Delete profile - only user can delete their own profile"""
@@ -174,39 +257,51 @@ async def delete_profile(
                 detail="You are not authorized to delete this profile"
             )
         
-        db_profile = db.query(Profile).filter(Profile.id == profile_id).first()
+        db_profile = await db.get(Profile, profile_id)
         if not db_profile:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Profile with ID '{profile_id}' not found"
             )
         
-        # Delete avatar file if exists
-        if db_profile.avatar_url:
-            try:
-                avatar_path = db_profile.avatar_url.replace("http://localhost:8000/", "")
-                if os.path.exists(avatar_path):
-                    os.remove(avatar_path)
-            except Exception as e:
-                pass
-        db.delete(db_profile)
-        db.commit()
+        # Unreferenced avatar files are removed by the background reclaimer
+        await release_blob(db, db_profile.avatar_hash)
+        await db.delete(db_profile)
+        await profile_changed(db, profile_id)
+        await db.commit()
+        known_profiles.discard(profile_id)
         return {"message": "Profile deleted successfully"}
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
 
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete profile: {str(e)}"
         )
 
-@router.post("/api/profile/{profile_id}/avatar", tags=["Profiles"])
+# The body is parsed by hand (see stream_upload), so describe it for the docs
+AVATAR_UPLOAD_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file"],
+                    "properties": {"file": {"type": "string", "format": "binary"}}
+                }
+            }
+        }
+    }
+}
+
+@router.post("/api/profile/{profile_id}/avatar", tags=["Profiles"], openapi_extra=AVATAR_UPLOAD_BODY)
 async def upload_avatar(
     profile_id: str,
-    file: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
     token_data: dict = Depends(get_token_data)
 ):
     """Upload avatar image - saves to local storage"""
@@ -224,86 +319,120 @@ async def upload_avatar(
                 detail="You are not authorized to upload avatar for this profile"
             )
         
-        db_profile = db.query(Profile).filter(Profile.id == profile_id).first()
-        if not db_profile:
+        # Parse the multipart body straight off the socket into a temp file, stopping at
+        # MAX_FILE_SIZE - nothing is spooled in memory or on disk beforehand
+        try:
+            upload = await stream_upload(request, "file", MAX_FILE_SIZE)
+        except UploadTooLarge:
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Profile with ID '{profile_id}' not found"
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"File too large. Maximum size is {MAX_FILE_SIZE / (1024*1024):.1f}MB"
+            )
+        except InvalidUpload as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
             )
+        temp_path, header, content_hash = upload.temp_path, upload.header, upload.content_hash
         
         # Validate file extension
-        if not file.filename:
+        if not upload.filename:
+            await discard(temp_path)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="No filename provided"
             )
         
-        file_ext = Path(file.filename).suffix.lower()
+        file_ext = Path(upload.filename).suffix.lower()
         if file_ext not in ALLOWED_EXTENSIONS:
+            await discard(temp_path)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Invalid file type. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"
             )
         
-        # Read file content
-        contents = await file.read()
-        
-        # Validate file size
-        if len(contents) > MAX_FILE_SIZE:
+        # Trust the content, not the filename
+        sniffed_ext = sniff_image_type(header)
+        if sniffed_ext is None:
+            await discard(temp_path)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"File too large. Maximum size is {MAX_FILE_SIZE / (1024*1024):.1f}MB"
+                detail=f"File is not a valid image. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"
             )
         
-        # Create uploads directory if it doesn't exist (use absolute path for Windows)
-        upload_dir = Path("uploads/avatars").resolve()
-        upload_dir.mkdir(parents=True, exist_ok=True)
-        
-        
-        # Generate unique filename: user_id + uuid + extension
-        # Replace | with _ in filename for filesystem compatibility
-        safe_user_id = profile_id.replace("|", "_").replace("/", "_").replace("\\", "_")
-        unique_filename = f"{safe_user_id}_{uuid.uuid4().hex[:8]}{file_ext}"
-        file_path = upload_dir / unique_filename
-        
+        # Lookups and image processing run on the read session; the writer is only taken
+        # for the final bookkeeping below
+        db_profile = await db.get(Profile, profile_id)
+        if not db_profile:
+            await discard(temp_path)
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Profile with ID '{profile_id}' not found"
+            )
         
-        # Delete old avatar if exists
-        if db_profile.avatar_url:
+        # Content-addressed: identical images share one file and one set of variants
+        original = blob_path(content_hash, sniffed_ext)
+        blob = await find_blob(db, content_hash)
+        if blob is not None:
+            await discard(temp_path)
+            variants = blob.variants
+            stored_size = blob.size
+        else:
             try:
-                # Extract filename from URL
-                old_url = db_profile.avatar_url
-                if "uploads/avatars/" in old_url:
-                    old_filename = old_url.split("uploads/avatars/")[-1]
-                    old_path = upload_dir / old_filename
-                    if old_path.exists():
-                        old_path.unlink()
-            except Exception as e:
-                print(f"⚠️ Warning: Could not delete old avatar: {e}")
+                file_path = await move_into_place(temp_path, original)
+            except OSError as e:
+                await discard(temp_path)
+                import traceback
+                traceback.print_exc()
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"Failed to save file: {str(e)}"
+                )
+            
+            # Downscaled WebP/JPEG variants, generated in the process pool
+            try:
+                generated = await generate_variants(file_path, file_path.parent, content_hash)
+            except AvatarProcessingError as e:
+                await discard(file_path)
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Image could not be processed: {str(e)}"
+                )
+            shard = str(Path(original).parent)
+            variants = {
+                px: {ext: f"{shard}/{name}" for ext, name in files.items()}
+                for px, files in generated.items()
+            }
+            stored_size = (await run_in_threadpool(file_path.stat)).st_size
         
-        # Save file
-        try:
-            with open(file_path, "wb") as f:
-                f.write(contents)
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to save file: {str(e)}"
-            )
+        avatar_url = avatar_url_for(original)
+        avatar_variants = variant_urls(variants)
+        if db_profile.avatar_hash == content_hash:
+            return {"avatarUrl": avatar_url, "avatarVariants": avatar_variants, "message": "Avatar uploaded successfully"}
         
         # Update profile with new avatar URL
-        avatar_url = f"http://localhost:8000/uploads/avatars/{unique_filename}"
-        db_profile.avatar_url = avatar_url
-        db.commit()
-        db.refresh(db_profile)
-        
+        # The old files are left for the background reclaimer
+        async with AsyncWriteSessionLocal() as write_db:
+            # Re-read inside the write transaction: the avatar may have changed meanwhile
+            db_profile = await write_db.get(Profile, profile_id)
+            if not db_profile:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Profile with ID '{profile_id}' not found"
+                )
+            if db_profile.avatar_hash != content_hash:
+                await acquire_blob(write_db, content_hash, sniffed_ext, stored_size, variants)
+                await release_blob(write_db, db_profile.avatar_hash)
+                db_profile.avatar_url = avatar_url
+                db_profile.avatar_variants = avatar_variants
+                db_profile.avatar_hash = content_hash
+                await profile_changed(write_db, profile_id)
+                await write_db.commit()
         
-        return {"avatarUrl": avatar_url, "message": "Avatar uploaded successfully"}
+        return {"avatarUrl": avatar_url, "avatarVariants": avatar_variants, "message": "Avatar uploaded successfully"}
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
         import traceback
         traceback.print_exc()
         raise HTTPException(
@@ -1,38 +1,51 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
-from sqlalchemy.orm import Session
-from typing import List
-from database import get_db
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from database import get_async_db, get_async_write_db
 from Models.ProjectModel import Project
-from Schemas.ProjectSchema import ProjectCreate, ProjectResponse
+from Schemas.ProjectSchema import ProjectCreate, ProjectResponse, ProjectBulkRequest
+from Schemas.BulkSchema import BulkResponse
 from auth import get_token_data, get_user_id_from_token
+from profile_events import profile_changed
+from response_cache import cached_response, profile_tag
+from pagination import list_page, MAX_PAGE_SIZE
+from bulk import apply_bulk
+from fast_json import orm_list_response
 
 router = APIRouter()
 
 # Get projects by profile_id - use query parameter to avoid conflict
 @router.get("/api/projects", response_model=List[ProjectResponse], tags=["Projects"])
 async def get_projects(
+    request: Request,
     profile_id: str = Query(..., description="Profile ID to get projects for"),
-    db: Session = Depends(get_db),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; omit to get the full list"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,title"),
+    db: AsyncSession = Depends(get_async_db),
     token_data: dict = Depends(get_token_data)
 ):
-    projects = db.query(Project).filter(Project.profile_id == profile_id).order_by(Project.sort_order).all()
-    return projects
+    async def build():
+        return await list_page(db, Project, ProjectResponse, profile_id, limit, cursor, fields)
+    
+    return await cached_response(request, (profile_tag(profile_id),), build)
 
 # Get current user's projects - convenience endpoint
 @router.get("/api/projects/me", response_model=List[ProjectResponse], tags=["Projects"])
 async def get_my_projects(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     token_data: dict = Depends(get_token_data)
 ):
     """Get all projects for the current authenticated user"""
     user_id = get_user_id_from_token(token_data)
-    projects = db.query(Project).filter(Project.profile_id == user_id).order_by(Project.sort_order).all()
-    return projects
+    result = await db.execute(select(Project).where(Project.profile_id == user_id).order_by(Project.sort_order))
+    return orm_list_response(ProjectResponse, result.scalars())
 
 @router.post("/api/projects", response_model=ProjectResponse, tags=["Projects"])
 async def create_project(
     project: ProjectCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_write_db),
     token_data: dict = Depends(get_token_data)
 ):
     user_id = get_user_id_from_token(token_data)
@@ -45,19 +58,20 @@ async def create_project(
         sort_order=project.sort_order or 0
     )
     db.add(db_project)
-    db.commit()
-    db.refresh(db_project)
+    await profile_changed(db, user_id)
+    await db.commit()
+    await db.refresh(db_project)
     return db_project
 
 # Get single project by ID - this route now works correctly
 @router.get("/api/projects/{project_id}", response_model=ProjectResponse, tags=["Projects"])
 async def get_project_by_id(
     project_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     token_data: dict = Depends(get_token_data)
 ):
     """Get a single project by its ID"""
-    db_project = db.query(Project).filter(Project.id == project_id).first()
+    db_project = await db.get(Project, project_id)
     if not db_project:
         raise HTTPException(status_code=404, detail="Project not found")
     return db_project
@@ -66,10 +80,10 @@ async def get_project_by_id(
 async def update_project(
     project_id: int,
     project: ProjectCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_write_db),
     token_data: dict = Depends(get_token_data)
 ):
-    db_project = db.query(Project).filter(Project.id == project_id).first()
+    db_project = await db.get(Project, project_id)
     if not db_project:
         raise HTTPException(status_code=404, detail="Project not found")
     
@@ -78,20 +92,40 @@ async def update_project(
     db_project.project_link = project.project_link
     db_project.sort_order = project.sort_order or 0
     
-    db.commit()
-    db.refresh(db_project)
+    await profile_changed(db, db_project.profile_id)
+    await db.commit()
+    await db.refresh(db_project)
     return db_project
 
 @router.delete("/api/projects/{project_id}", tags=["Projects"])
 async def delete_project(
     project_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_write_db),
     token_data: dict = Depends(get_token_data)
 ):
-    db_project = db.query(Project).filter(Project.id == project_id).first()
+    db_project = await db.get(Project, project_id)
     if not db_project:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    db.delete(db_project)
-    db.commit()
+    await db.delete(db_project)
+    await profile_changed(db, db_project.profile_id)
+    await db.commit()
     return {"message": "Project deleted"}
+
+# Fields a create/update sets - same as the single-item endpoints above
+BULK_FIELDS = ("title", "description", "project_link", "sort_order")
+
+@router.post("/api/projects/bulk", response_model=BulkResponse, tags=["Projects"])
+async def bulk_projects(
+    bulk_request: ProjectBulkRequest,
+    db: AsyncSession = Depends(get_async_write_db),
+    token_data: dict = Depends(get_token_data)
+):
+    """Apply many creates, updates, sort_order changes and deletes in one transaction"""
+    user_id = get_user_id_from_token(token_data)
+    
+    outcome = await apply_bulk(db, Project, user_id, bulk_request, BULK_FIELDS)
+    if outcome.written:
+        await profile_changed(db, user_id)
+        await db.commit()
+    return {"results": outcome.results}
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from database import get_async_db
+from Schemas.SearchSchema import SearchResult
+from search import search_profiles
+from pagination import MAX_PAGE_SIZE
+
+router = APIRouter()
+
+@router.get("/api/search", response_model=List[SearchResult], tags=["Search"])
+async def search(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find in names, services, projects and jobs; the last word matches as a prefix"),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Full-text search over public profiles, best matches first - public endpoint"""
+    page = await search_profiles(db, q, limit, cursor)
+    return Response(content=page.body, media_type="application/json", headers=page.headers)
@@ -1,26 +1,37 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
-from sqlalchemy.orm import Session
-from typing import List
-from database import get_db
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from database import get_async_db, get_async_write_db
 from Models.ServiceModel import Service
-from Schemas.ServiceSchema import ServiceCreate, ServiceResponse
+from Schemas.ServiceSchema import ServiceCreate, ServiceResponse, ServiceBulkRequest
+from Schemas.BulkSchema import BulkResponse
 from auth import get_token_data, get_user_id_from_token
+from profile_events import profile_changed
+from response_cache import cached_response, profile_tag
+from pagination import list_page, MAX_PAGE_SIZE
+from bulk import apply_bulk
 
 router = APIRouter()
 
 @router.get("/api/services", response_model=List[ServiceResponse], tags=["Services"])
 async def get_services(
+    request: Request,
     profile_id: str = Query(..., description="Profile ID to get services for"),
-    db: Session = Depends(get_db),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; omit to get the full list"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,title"),
+    db: AsyncSession = Depends(get_async_db),
     token_data: dict = Depends(get_token_data)
 ):
-    services = db.query(Service).filter(Service.profile_id == profile_id).order_by(Service.sort_order).all()
-    return services
+    async def build():
+        return await list_page(db, Service, ServiceResponse, profile_id, limit, cursor, fields)
+    
+    return await cached_response(request, (profile_tag(profile_id),), build)
 
 @router.post("/api/services", response_model=ServiceResponse, tags=["Services"])
 async def create_service(
     service: ServiceCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_write_db),
     token_data: dict = Depends(get_token_data)
 ):
     user_id = get_user_id_from_token(token_data)
@@ -32,16 +43,17 @@ async def create_service(
         sort_order=service.sort_order or 0
     )
     db.add(db_service)
-    db.commit()
-    db.refresh(db_service)
+    await profile_changed(db, user_id)
+    await db.commit()
+    await db.refresh(db_service)
     return db_service
 
 @router.get("/api/services/{service_id}", response_model=ServiceResponse, tags=["Services"])
 async def get_service_by_id(
     service_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    db_service = db.query(Service).filter(Service.id == service_id).first()
+    db_service = await db.get(Service, service_id)
     if not db_service:
         raise HTTPException(status_code=404, detail="Service not found")
     return db_service
@@ -50,10 +62,10 @@ async def get_service_by_id(
 async def update_service(
     service_id: int,
     service: ServiceCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_write_db),
     token_data: dict = Depends(get_token_data)
 ):
-    db_service = db.query(Service).filter(Service.id == service_id).first()
+    db_service = await db.get(Service, service_id)
     if not db_service:
         raise HTTPException(status_code=404, detail="Service not found")
     
@@ -61,20 +73,40 @@ async def update_service(
     db_service.description = service.description
     db_service.sort_order = service.sort_order or 0
     
-    db.commit()
-    db.refresh(db_service)
+    await profile_changed(db, db_service.profile_id)
+    await db.commit()
+    await db.refresh(db_service)
     return db_service
 
 @router.delete("/api/services/{service_id}", tags=["Services"])
 async def delete_service(
     service_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_write_db),
     token_data: dict = Depends(get_token_data)
 ):
-    db_service = db.query(Service).filter(Service.id == service_id).first()
+    db_service = await db.get(Service, service_id)
     if not db_service:
         raise HTTPException(status_code=404, detail="Service not found")
     
-    db.delete(db_service)
-    db.commit()
+    await db.delete(db_service)
+    await profile_changed(db, db_service.profile_id)
+    await db.commit()
     return {"message": "Service deleted"}
+
+# Fields a create/update sets - same as the single-item endpoints above
+BULK_FIELDS = ("title", "description", "sort_order")
+
+@router.post("/api/services/bulk", response_model=BulkResponse, tags=["Services"])
+async def bulk_services(
+    bulk_request: ServiceBulkRequest,
+    db: AsyncSession = Depends(get_async_write_db),
+    token_data: dict = Depends(get_token_data)
+):
+    """Apply many creates, updates, sort_order changes and deletes in one transaction"""
+    user_id = get_user_id_from_token(token_data)
+    
+    outcome = await apply_bulk(db, Service, user_id, bulk_request, BULK_FIELDS)
+    if outcome.written:
+        await profile_changed(db, user_id)
+        await db.commit()
+    return {"results": outcome.results}
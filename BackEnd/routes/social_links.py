@@ -1,29 +1,40 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
-from sqlalchemy.orm import Session
-from typing import List
-from database import get_db
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from database import get_async_db, get_async_write_db
 from Models.SocialLinkModel import SocialLink
-from Schemas.SocialLinksSchema import SocialLinkCreate, SocialLinkResponse
+from Schemas.SocialLinksSchema import SocialLinkCreate, SocialLinkResponse, SocialLinkBulkRequest
+from Schemas.BulkSchema import BulkResponse
 from auth import get_token_data, get_user_id_from_token
+from profile_events import profile_changed
+from response_cache import cached_response, profile_tag
+from pagination import list_page, MAX_PAGE_SIZE
+from bulk import apply_bulk
 
 router = APIRouter()
 
 # Remove trailing slash to match frontend calls
 @router.get("/api/social-links", response_model=List[SocialLinkResponse], tags=["Social Links"])
 async def get_social_links(
+    request: Request,
     profile_id: str = Query(..., description="Profile ID to get social links for"),
-    db: Session = Depends(get_db),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; omit to get the full list"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,title"),
+    db: AsyncSession = Depends(get_async_db),
     token_data: dict = Depends(get_token_data)
 ):
-    links = db.query(SocialLink).filter(SocialLink.profile_id == profile_id).all()
-    return links
+    async def build():
+        return await list_page(db, SocialLink, SocialLinkResponse, profile_id, limit, cursor, fields)
+    
+    return await cached_response(request, (profile_tag(profile_id),), build)
 
 @router.get("/api/social-links/{link_id}", response_model=SocialLinkResponse, tags=["Social Links"])
 async def get_social_link_by_id(
     link_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    db_link = db.query(SocialLink).filter(SocialLink.id == link_id).first()
+    db_link = await db.get(SocialLink, link_id)
     if not db_link:
         raise HTTPException(status_code=404, detail="Social link not found")
     return db_link
@@ -31,7 +42,7 @@ async def get_social_link_by_id(
 @router.post("/api/social-links", response_model=SocialLinkResponse, tags=["Social Links"])
 async def create_social_link(
     link: SocialLinkCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_write_db),
     token_data: dict = Depends(get_token_data)
 ):
     user_id = get_user_id_from_token(token_data)
@@ -41,38 +52,59 @@ async def create_social_link(
         url=link.url
     )
     db.add(db_link)
-    db.commit()
-    db.refresh(db_link)
+    await profile_changed(db, user_id)
+    await db.commit()
+    await db.refresh(db_link)
     return db_link
 
 @router.put("/api/social-links/{link_id}", response_model=SocialLinkResponse, tags=["Social Links"])
 async def update_social_link(
     link_id: int,
     link: SocialLinkCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_write_db),
     token_data: dict = Depends(get_token_data)
 ):
-    db_link = db.query(SocialLink).filter(SocialLink.id == link_id).first()
+    db_link = await db.get(SocialLink, link_id)
     if not db_link:
         raise HTTPException(status_code=404, detail="Social link not found")
     
     db_link.platform = link.platform
     db_link.url = link.url
     
-    db.commit()
-    db.refresh(db_link)
+    await profile_changed(db, db_link.profile_id)
+    await db.commit()
+    await db.refresh(db_link)
     return db_link
 
 @router.delete("/api/social-links/{link_id}", tags=["Social Links"])
 async def delete_social_link(
     link_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_write_db),
     token_data: dict = Depends(get_token_data)
 ):
-    db_link = db.query(SocialLink).filter(SocialLink.id == link_id).first()
+    db_link = await db.get(SocialLink, link_id)
     if not db_link:
         raise HTTPException(status_code=404, detail="Social link not found")
     
-    db.delete(db_link)
-    db.commit()
+    await db.delete(db_link)
+    await profile_changed(db, db_link.profile_id)
+    await db.commit()
     return {"message": "Social link deleted"}
+
+# Fields a create/update sets - same as the single-item endpoints above
+BULK_FIELDS = ("platform", "url")
+
+@router.post("/api/social-links/bulk", response_model=BulkResponse, tags=["Social Links"])
+async def bulk_social_links(
+    bulk_request: SocialLinkBulkRequest,
+    db: AsyncSession = Depends(get_async_write_db),
+    token_data: dict = Depends(get_token_data)
+):
+    """Apply many creates, updates and deletes in one transaction"""
+    user_id = get_user_id_from_token(token_data)
+    
+    outcome = await apply_bulk(db, SocialLink, user_id, bulk_request, BULK_FIELDS)
+    if outcome.written:
+        await profile_changed(db, user_id)
+        await db.commit()
+    return {"results": outcome.results}
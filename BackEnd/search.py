@@ -0,0 +1,145 @@
+import hashlib
+import math
+import re
+from typing import Optional
+import orjson
+from fastapi import HTTPException, status
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from response_cache import CachedBody
+from pagination import Cursor, encode_cursor, decode_cursor, NEXT_CURSOR_HEADER
+
+MAX_QUERY_TERMS = 8
+# bm25 column weights: profile_id (unindexed), name, services, projects, jobs
+BM25_WEIGHTS = "0.0, 10.0, 4.0, 2.0, 2.0"
+
+# Rank and page on the FTS table alone. Only rowid and bm25 are read per match: selecting
+# a stored column (profile_id) or snippet() here would load every matching document.
+SEARCH_SQL = f"""
+SELECT rowid, score
+FROM (
+    SELECT rowid, bm25(profile_search, {BM25_WEIGHTS}) AS score
+    FROM profile_search
+    WHERE profile_search MATCH :query
+)
+WHERE :after_score IS NULL
+   OR score > :after_score
+   OR (score = :after_score AND rowid > :after_rowid)
+ORDER BY score, rowid
+LIMIT :limit
+"""
+
+# Card fields and snippets for one page (:rowids is a JSON array). The unary + keeps the
+# rowid list from being used as an index constraint, which would re-run the MATCH once per row.
+PAGE_SQL = """
+SELECT s.rowid AS rowid,
+       s.profile_id AS profile_id,
+       snippet(profile_search, -1, '[', ']', '…', 12) AS snippet,
+       p.FirstName AS first_name,
+       p.LastName AS last_name,
+       p.avatar_url AS avatar_url
+FROM profile_search AS s
+JOIN profiles AS p ON p.id = s.profile_id
+WHERE profile_search MATCH :query AND +s.rowid IN (SELECT value FROM json_each(:rowids))
+"""
+
+UPSERT_SQL = text("""
+INSERT OR REPLACE INTO profile_search (rowid, profile_id, name, services, projects, jobs)
+VALUES (:rowid, :profile_id, :name, :services, :projects, :jobs)
+""")
+DELETE_SQL = text("DELETE FROM profile_search WHERE rowid = :rowid")
+
+
+def search_rowid(profile_id: str) -> int:
+    """Stable 63-bit FTS rowid for a profile, so updates and deletes are rowid lookups"""
+    return int.from_bytes(hashlib.sha256(profile_id.encode()).digest()[:8], "big") >> 1
+
+
+def _visible_text(items: list[dict], *fields: str) -> str:
+    return "\n".join(
+        item.get(field) or ""
+        for item in items
+        if item.get("appear", True)
+        for field in fields
+    )
+
+
+def search_document(profile: dict) -> dict:
+    """FTS row for a serialized ProfileResponse - only publicly visible content is indexed"""
+    return {
+        "rowid": search_rowid(profile["id"]),
+        "profile_id": profile["id"],
+        "name": " ".join(filter(None, (profile.get("FirstName"), profile.get("LastName")))),
+        "services": _visible_text(profile.get("services") or [], "title", "description"),
+        "projects": _visible_text(profile.get("projects") or [], "title", "description"),
+        "jobs": _visible_text(profile.get("jobs") or [], "title", "description"),
+    }
+
+
+async def index_profile(db: AsyncSession, profile_id: str, profile: Optional[dict]):
+    """Replace a profile's search document from its serialized snapshot, or drop it if the profile is gone"""
+    if profile is None:
+        await db.execute(DELETE_SQL, {"rowid": search_rowid(profile_id)})
+        return
+    await db.execute(UPSERT_SQL, search_document(profile))
+
+
+def build_match_query(q: str) -> str:
+    """Turn free text into an FTS5 query: every word must match, the last one as a prefix.
+
+    Words are quoted, so FTS5 operators and column filters typed by users are treated as text.
+    """
+    terms = re.findall(r"\w+", q)[:MAX_QUERY_TERMS]
+    if not terms:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Search query must contain a word")
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " AND ".join(quoted)
+
+
+async def search_profiles(db: AsyncSession, q: str, limit: int, cursor: Optional[str] = None) -> CachedBody:
+    """Ranked (bm25) profile search, keyset-paginated on (score, rowid)"""
+    after_score = after_rowid = None
+    if cursor is not None:
+        after_score, after_rowid = decode_cursor(cursor, (float, int)).key
+        # json.loads accepts NaN and Infinity; bm25 never produces them, so the cursor is forged
+        if not math.isfinite(after_score):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+    query = build_match_query(q)
+    result = await db.execute(text(SEARCH_SQL), {
+        "query": query,
+        "after_score": after_score,
+        "after_rowid": after_rowid,
+        "limit": limit + 1,
+    })
+    hits = result.all()
+
+    headers = {}
+    if len(hits) > limit:
+        hits = hits[:limit]
+        last = hits[-1]
+        # Ranks can shift between pages as profiles change; no version check for search
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(Cursor((last.score, last.rowid), 0))
+
+    details = {}
+    if hits:
+        result = await db.execute(text(PAGE_SQL), {
+            "query": query,
+            "rowids": orjson.dumps([hit.rowid for hit in hits]).decode(),
+        })
+        details = {row.rowid: row for row in result.all()}
+
+    body = orjson.dumps([
+        {
+            "profile_id": row.profile_id,
+            "FirstName": row.first_name,
+            "LastName": row.last_name,
+            "avatar_url": row.avatar_url,
+            "score": -hit.score,  # bm25 is lower-is-better; expose higher-is-better
+            "snippet": row.snippet,
+        }
+        for hit in hits
+        if (row := details.get(hit.rowid)) is not None
+    ])
+    return CachedBody(body, headers)
@@ -0,0 +1,62 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+
+class SingleFlight:
+    """Coalesces concurrent calls for the same key into one upstream call.
+
+    Callers that arrive while a call is in flight await the same task. Results accepted
+    by `should_cache` are kept for `result_ttl` seconds so stragglers reuse them too.
+    The shared task is shielded, so one caller disconnecting doesn't cancel it for the others.
+    """
+
+    def __init__(
+        self,
+        result_ttl: float = 0.0,
+        maxsize: int = 10000,
+        should_cache: Optional[Callable[[Any], bool]] = None
+    ):
+        self.result_ttl = result_ttl
+        self.maxsize = maxsize
+        self.should_cache = should_cache or (lambda result: True)
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._results: dict[str, tuple[float, Any]] = {}
+        self.calls = 0
+        self.shared = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        cached = self._results.get(key)
+        if cached is not None:
+            expires_at, result = cached
+            if expires_at > time.monotonic():
+                self.shared += 1
+                return result
+            del self._results[key]
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t))
+        else:
+            self.shared += 1
+
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Task):
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+
+        result = task.result()
+        if self.result_ttl <= 0 or not self.should_cache(result):
+            return
+
+        now = time.monotonic()
+        if len(self._results) >= self.maxsize:
+            self._results = {k: v for k, v in self._results.items() if v[0] > now}
+            if len(self._results) >= self.maxsize:
+                self._results.pop(next(iter(self._results)))
+        self._results[key] = (now + self.result_ttl, result)
@@ -0,0 +1,138 @@
+from typing import NamedTuple, Optional
+from sqlalchemy import select, delete, func
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import selectinload
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from Models.ProfileModel import Profile
+from Models.ProfileSnapshotModel import ProfileSnapshot
+from Schemas.ProfileSchema import ProfileResponse
+from fast_json import dump_orm
+from database import AsyncWriteSessionLocal
+
+class Snapshot(NamedTuple):
+    payload: bytes
+    version: int
+
+async def load_profile(db: AsyncSession, profile_id: str) -> Optional[Profile]:
+    """Load a profile with all related data eagerly loaded (async sessions can't lazy-load)"""
+    # selectinload issues one IN query per collection; joinedload-ing all four in one
+    # query returns jobs x services x projects x links rows for SQLAlchemy to de-duplicate
+    result = await db.execute(
+        select(Profile)
+        .options(
+            selectinload(Profile.jobs),
+            selectinload(Profile.services),
+            selectinload(Profile.projects),
+            selectinload(Profile.social_links)
+        )
+        .where(Profile.id == profile_id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one_or_none()
+
+async def load_profiles(db: AsyncSession, profile_ids: list[str]) -> list[Profile]:
+    """Load many profiles with their children: one IN query for profiles plus one per collection"""
+    if not profile_ids:
+        return []
+    result = await db.execute(
+        select(Profile)
+        .options(
+            selectinload(Profile.jobs),
+            selectinload(Profile.services),
+            selectinload(Profile.projects),
+            selectinload(Profile.social_links)
+        )
+        .where(Profile.id.in_(profile_ids))
+        .execution_options(populate_existing=True)
+    )
+    return list(result.scalars())
+
+def serialize_profile(profile: Profile) -> bytes:
+    return dump_orm(ProfileResponse, profile)
+
+async def get_snapshot(db: AsyncSession, profile_id: str) -> Optional[Snapshot]:
+    result = await db.execute(
+        select(ProfileSnapshot.payload, ProfileSnapshot.version).where(ProfileSnapshot.profile_id == profile_id)
+    )
+    row = result.one_or_none()
+    return Snapshot(row.payload, row.version) if row is not None else None
+
+async def refresh_snapshot(db: AsyncSession, profile_id: str) -> Optional[Snapshot]:
+    """Rebuild a profile's snapshot inside the caller's write transaction - call before commit"""
+    await db.flush()
+    profile = await load_profile(db, profile_id)
+    if profile is None:
+        await delete_snapshot(db, profile_id)
+        return None
+
+    snapshot = Snapshot(serialize_profile(profile), profile.version)
+    stmt = sqlite_insert(ProfileSnapshot).values(
+        profile_id=profile_id,
+        payload=snapshot.payload,
+        version=snapshot.version
+    )
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=[ProfileSnapshot.profile_id],
+        set_={"payload": stmt.excluded.payload, "version": stmt.excluded.version, "updated_at": func.now()}
+    ))
+    return snapshot
+
+async def delete_snapshot(db: AsyncSession, profile_id: str):
+    await db.execute(delete(ProfileSnapshot).where(ProfileSnapshot.profile_id == profile_id))
+
+async def backfill_snapshots(built: dict[str, Snapshot]):
+    """Store snapshots built on the read path, through the single writer rather than the read session.
+
+    Best effort: the caller already has the snapshots to serve, so a failed store is only a warning.
+    """
+    try:
+        async with AsyncWriteSessionLocal() as write_db:
+            # DO NOTHING: a write that committed meanwhile already stored a newer snapshot
+            await write_db.execute(
+                sqlite_insert(ProfileSnapshot).on_conflict_do_nothing(index_elements=[ProfileSnapshot.profile_id]),
+                [
+                    {"profile_id": profile_id, "payload": snapshot.payload, "version": snapshot.version}
+                    for profile_id, snapshot in built.items()
+                ]
+            )
+            await write_db.commit()
+    except SQLAlchemyError as e:
+        print(f"⚠️ Warning: Could not store {len(built)} built snapshot(s): {e}")
+
+async def get_or_build_snapshot(db: AsyncSession, profile_id: str) -> Optional[Snapshot]:
+    """Read path: return the stored snapshot, building it once for profiles that predate snapshots"""
+    snapshot = await get_snapshot(db, profile_id)
+    if snapshot is not None:
+        return snapshot
+
+    profile = await load_profile(db, profile_id)
+    if profile is None:
+        return None
+
+    snapshot = Snapshot(serialize_profile(profile), profile.version)
+    await backfill_snapshots({profile_id: snapshot})
+    return snapshot
+
+async def get_or_build_snapshots(db: AsyncSession, profile_ids: list[str]) -> dict[str, Snapshot]:
+    """Batch read path: stored snapshots in one IN query, building any that are missing"""
+    if not profile_ids:
+        return {}
+    result = await db.execute(
+        select(ProfileSnapshot.profile_id, ProfileSnapshot.payload, ProfileSnapshot.version)
+        .where(ProfileSnapshot.profile_id.in_(profile_ids))
+    )
+    snapshots = {row.profile_id: Snapshot(row.payload, row.version) for row in result}
+
+    unbuilt = [profile_id for profile_id in profile_ids if profile_id not in snapshots]
+    profiles = await load_profiles(db, unbuilt)
+    if profiles:
+        built = {profile.id: Snapshot(serialize_profile(profile), profile.version) for profile in profiles}
+        await backfill_snapshots(built)
+        snapshots.update(built)
+    return snapshots
+
+async def get_profile_version(db: AsyncSession, profile_id: str) -> Optional[int]:
+    """Primary-key lookup of just the version, for answering conditional GETs"""
+    result = await db.execute(select(Profile.version).where(Profile.id == profile_id))
+    return result.scalar_one_or_none()
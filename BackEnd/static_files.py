@@ -0,0 +1,276 @@
+import mimetypes
+import os
+import re
+import stat
+import time
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from typing import NamedTuple, Optional
+import anyio
+from starlette._utils import get_route_path
+from starlette.datastructures import Headers
+from starlette.responses import PlainTextResponse
+from starlette.types import Receive, Scope, Send
+from etags import etag_matches
+from config import (
+    UPLOADS_CACHE_CONTROL, UPLOADS_IMMUTABLE_CACHE_CONTROL,
+    UPLOADS_STAT_CACHE_SIZE, UPLOADS_STAT_CACHE_TTL
+)
+
+# Content-addressed avatar files: <sha256><ext> or <sha256>_<size>.<format>
+CONTENT_ADDRESSED = re.compile(r"^[0-9a-f]{64}(_\d+)?\.[a-z0-9]+$")
+# Precompressed siblings (file.svg.br, file.svg.gz), in order of preference
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+READ_CHUNK_SIZE = 64 * 1024
+ZEROCOPY = "http.response.zerocopy"
+
+
+class FileInfo(NamedTuple):
+    path: str
+    size: int
+    etag: str
+    last_modified: str
+    mtime: int
+
+
+class ByteRange(NamedTuple):
+    start: int
+    end: int  # Inclusive
+
+
+class StatCache:
+    """Small LRU of os.stat results (including misses) so hot files skip the syscall"""
+
+    def __init__(self, maxsize: int = UPLOADS_STAT_CACHE_SIZE, ttl: float = UPLOADS_STAT_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, Optional[FileInfo]]] = OrderedDict()
+
+    async def get(self, path: str) -> Optional[FileInfo]:
+        now = time.monotonic()
+        entry = self._entries.get(path)
+        if entry is not None and now - entry[0] < self.ttl:
+            self._entries.move_to_end(path)
+            return entry[1]
+
+        info = await anyio.to_thread.run_sync(_stat_file, path)
+        self._entries[path] = (now, info)
+        self._entries.move_to_end(path)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return info
+
+
+def _stat_file(path: str) -> Optional[FileInfo]:
+    try:
+        result = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError, PermissionError):
+        return None
+    if not stat.S_ISREG(result.st_mode):
+        return None
+
+    name = os.path.basename(path)
+    if CONTENT_ADDRESSED.match(name):
+        etag = f'"{name}"'
+    else:
+        etag = f'"{result.st_mtime_ns:x}-{result.st_size:x}"'
+    return FileInfo(path, result.st_size, etag, formatdate(result.st_mtime, usegmt=True), int(result.st_mtime))
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[ByteRange]:
+    """Parse a single `bytes=` range. Returns None to serve the whole file, raises ValueError if unsatisfiable."""
+    if not header or not header.startswith("bytes="):
+        return None
+    spec = header[len("bytes="):].strip()
+    if "," in spec:
+        # Multipart ranges aren't worth it for avatars; ignoring Range is allowed
+        return None
+    first, _, last = spec.partition("-")
+    try:
+        if not first:
+            length = int(last)
+            if length <= 0:
+                raise ValueError
+            return ByteRange(max(size - length, 0), size - 1)
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size or end < start:
+        raise ValueError
+    return ByteRange(start, min(end, size - 1))
+
+
+def accepted_encodings(header: Optional[str]) -> set[str]:
+    accepted = set()
+    for item in (header or "").split(","):
+        coding, _, params = item.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        if coding:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+class UploadsFiles:
+    """ASGI app serving user uploads.
+
+    Compared to StaticFiles it adds byte ranges, If-Modified-Since, precompressed
+    .br/.gz siblings, a stat cache and configurable Cache-Control. Bodies go out via
+    the server's zero-copy extension (sendfile) when it advertises one, and in chunks
+    read off the event loop otherwise.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        exclude: tuple[str, ...] = (),
+        cache_control: str = UPLOADS_CACHE_CONTROL,
+        immutable_cache_control: str = UPLOADS_IMMUTABLE_CACHE_CONTROL,
+        stat_cache: Optional[StatCache] = None
+    ):
+        self.directory = os.path.realpath(directory)
+        self.exclude = exclude
+        self.cache_control = cache_control
+        self.immutable_cache_control = immutable_cache_control
+        self.stat_cache = stat_cache or StatCache()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        assert scope["type"] == "http"
+        if scope["method"] not in ("GET", "HEAD"):
+            response = PlainTextResponse("Method Not Allowed", status_code=405, headers={"Allow": "GET, HEAD"})
+            await response(scope, receive, send)
+            return
+
+        full_path = self.resolve(get_route_path(scope))
+        info = await self.stat_cache.get(full_path) if full_path else None
+        if info is None:
+            await PlainTextResponse("Not Found", status_code=404)(scope, receive, send)
+            return
+
+        await self.serve(scope, send, info, Headers(scope=scope))
+
+    def resolve(self, route_path: str) -> Optional[str]:
+        """Map a request path to a file inside the directory, refusing traversal and hidden/excluded paths"""
+        parts = [part for part in route_path.split("/") if part]
+        if not parts or parts[0] in self.exclude:
+            return None
+        if any(part.startswith(".") or "\\" in part or "\x00" in part for part in parts):
+            return None
+        full_path = os.path.realpath(os.path.join(self.directory, *parts))
+        if os.path.commonpath([full_path, self.directory]) != self.directory:
+            return None
+        return full_path
+
+    async def serve(self, scope: Scope, send: Send, info: FileInfo, request_headers: Headers):
+        name = os.path.basename(info.path)
+        media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        headers = {
+            "content-type": media_type,
+            "accept-ranges": "bytes",
+            "etag": info.etag,
+            "last-modified": info.last_modified,
+            "cache-control": self.immutable_cache_control if CONTENT_ADDRESSED.match(name) else self.cache_control,
+            "vary": "Accept-Encoding",
+        }
+
+        range_header = request_headers.get("range")
+        if range_header and not self.if_range_matches(info, request_headers.get("if-range")):
+            range_header = None
+
+        if not range_header:
+            # Ranges always address the identity encoding
+            encoded = await self.precompressed(info, request_headers.get("accept-encoding"))
+            if encoded is not None:
+                encoding, info = encoded
+                headers["content-encoding"] = encoding
+                headers["etag"] = info.etag
+
+        if self.is_not_modified(info, request_headers):
+            await self.send_headers(send, 304, headers, more_body=False)
+            return
+
+        try:
+            byte_range = parse_range(range_header, info.size)
+        except ValueError:
+            headers = {"content-range": f"bytes */{info.size}", "content-length": "0"}
+            await self.send_headers(send, 416, headers, more_body=False)
+            return
+
+        status_code = 200
+        offset, count = 0, info.size
+        if byte_range is not None:
+            status_code = 206
+            offset, count = byte_range.start, byte_range.end - byte_range.start + 1
+            headers["content-range"] = f"bytes {byte_range.start}-{byte_range.end}/{info.size}"
+        headers["content-length"] = str(count)
+
+        if scope["method"] == "HEAD" or count == 0:
+            await self.send_headers(send, status_code, headers, more_body=False)
+            return
+
+        await self.send_headers(send, status_code, headers, more_body=True)
+        await self.send_file(scope, send, info.path, offset, count)
+
+    def is_not_modified(self, info: FileInfo, request_headers: Headers) -> bool:
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match:
+            return etag_matches(if_none_match, info.etag)
+
+        if_modified_since = request_headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                return info.mtime <= int(parsedate_to_datetime(if_modified_since).timestamp())
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def if_range_matches(self, info: FileInfo, if_range: Optional[str]) -> bool:
+        """If-Range needs a strong validator match, otherwise the full file is sent"""
+        if not if_range:
+            return True
+        if if_range.startswith('"'):
+            return if_range == info.etag
+        return if_range == info.last_modified
+
+    async def precompressed(self, info: FileInfo, accept_encoding: Optional[str]) -> Optional[tuple[str, FileInfo]]:
+        accepted = accepted_encodings(accept_encoding)
+        for encoding, suffix in PRECOMPRESSED:
+            if encoding not in accepted and "*" not in accepted:
+                continue
+            encoded = await self.stat_cache.get(info.path + suffix)
+            if encoded is not None:
+                return encoding, encoded._replace(etag=f'{info.etag[:-1]}-{encoding}"')
+        return None
+
+    async def send_headers(self, send: Send, status_code: int, headers: dict[str, str], more_body: bool):
+        await send({
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [(key.encode("latin-1"), value.encode("latin-1")) for key, value in headers.items()],
+        })
+        if not more_body:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    async def send_file(self, scope: Scope, send: Send, path: str, offset: int, count: int):
+        if ZEROCOPY in scope.get("extensions", {}):
+            # The server sendfile()s straight from the descriptor; no bytes pass through Python
+            file = await anyio.to_thread.run_sync(open, path, "rb")
+            try:
+                await send({"type": ZEROCOPY, "file": file, "offset": offset, "count": count, "more_body": False})
+            finally:
+                file.close()
+            return
+
+        async with await anyio.open_file(path, "rb") as file:
+            await file.seek(offset)
+            remaining = count
+            while remaining > 0:
+                chunk = await file.read(min(READ_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+        if remaining > 0:
+            # File shrank under us; end the response rather than hang
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
@@ -0,0 +1,181 @@
+from datetime import datetime
+from typing import AsyncIterator, Callable, Iterable, NamedTuple, Optional
+import orjson
+from sqlalchemy import DateTime, Table, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from Models.ProfileModel import Profile
+from Models.JobModel import Job
+from Models.ServiceModel import Service
+from Models.ProjectModel import Project
+from Models.SocialLinkModel import SocialLink
+from Models.ProfileSummaryModel import ProfileSummary
+from search import UPSERT_SQL, search_document
+from directory import summary_row
+from config import TRANSFER_BATCH_SIZE
+
+# Child collections in each NDJSON line, keyed by the ProfileResponse field they export as
+CHILD_TABLES: dict[str, Table] = {
+    "jobs": Job.__table__,
+    "services": Service.__table__,
+    "projects": Project.__table__,
+    "social_links": SocialLink.__table__,
+}
+# Ids per IN query when checking imported child ids, well under SQLite's bound-parameter limit
+ID_LOOKUP_CHUNK = 900
+# Avatar files aren't part of an export, so imported avatars are plain URL references
+PROFILE_EXCLUDED_COLUMNS = {"avatar_hash"}
+
+PROFILE_COLUMNS = [column for column in Profile.__table__.columns if column.key not in PROFILE_EXCLUDED_COLUMNS]
+CHILD_COLUMNS = {
+    field: [column for column in table.columns if column.key != "profile_id"]
+    for field, table in CHILD_TABLES.items()
+}
+
+
+def _datetime_columns(columns) -> list[str]:
+    return [column.key for column in columns if isinstance(column.type, DateTime)]
+
+
+# Exported as ISO strings; the SQLite DateTime type only accepts datetime objects back
+PROFILE_DATETIMES = _datetime_columns(PROFILE_COLUMNS)
+CHILD_DATETIMES = {field: _datetime_columns(columns) for field, columns in CHILD_COLUMNS.items()}
+
+
+class ImportStats(NamedTuple):
+    profiles: int  # Profiles inserted
+    skipped: int  # Profiles that already existed, left untouched with their children
+    rows: int  # Profile and child rows inserted
+    skipped_children: int  # Child rows left out because their id was already taken
+
+
+async def export_profiles(
+    db: AsyncSession,
+    batch_size: int = TRANSFER_BATCH_SIZE,
+    on_batch: Optional[Callable[[int, int], None]] = None
+) -> AsyncIterator[bytes]:
+    """Stream every profile with its children as NDJSON, one profile per line.
+
+    Profiles come off one server-side cursor in batches of `batch_size`; each batch's
+    children are one IN query per table. Memory stays at one batch whatever the table
+    size, and all queries run on the cursor's connection, so they see the same snapshot.
+    Yields one chunk of lines per batch; `on_batch(profiles, rows)` gets each batch's counts.
+    """
+    result = await db.stream(
+        select(*PROFILE_COLUMNS).order_by(Profile.id).execution_options(yield_per=batch_size)
+    )
+    async for partition in result.partitions():
+        profiles = {row.id: dict(row._mapping) for row in partition}
+        rows = len(profiles)
+        for field, table in CHILD_TABLES.items():
+            for profile in profiles.values():
+                profile[field] = []
+            children = await db.execute(
+                select(table.c.profile_id, *CHILD_COLUMNS[field])
+                .where(table.c.profile_id.in_(list(profiles)))
+                .order_by(table.c.profile_id, table.c.id)
+            )
+            for row in children:
+                child = dict(row._mapping)
+                profiles[child.pop("profile_id")][field].append(child)
+                rows += 1
+        if on_batch is not None:
+            on_batch(len(profiles), rows)
+        yield b"".join(orjson.dumps(profile) + b"\n" for profile in profiles.values())
+
+
+def _parse_datetimes(row: dict, keys: list[str]) -> dict:
+    for key in keys:
+        if row.get(key) is not None:
+            row[key] = datetime.fromisoformat(row[key])
+    return row
+
+
+async def _import_batch(db: AsyncSession, profiles: list[dict]) -> tuple[int, int, int, int]:
+    ids = [profile["id"] for profile in profiles]
+    existing = set((await db.execute(select(Profile.id).where(Profile.id.in_(ids)))).scalars())
+    new = []
+    for profile in profiles:
+        # A profile repeated within the file counts as existing after its first line
+        if profile["id"] not in existing:
+            existing.add(profile["id"])
+            new.append(profile)
+    if not new:
+        return 0, len(profiles), 0, 0
+
+    profile_keys = [column.key for column in PROFILE_COLUMNS]
+    await db.execute(Profile.__table__.insert(), [
+        _parse_datetimes({key: profile.get(key) for key in profile_keys}, PROFILE_DATETIMES) for profile in new
+    ])
+    rows = len(new)
+    skipped_children = 0
+
+    # Parents first, so every child's profile_id already exists
+    for field, table in CHILD_TABLES.items():
+        child_keys = [column.key for column in CHILD_COLUMNS[field]]
+        # Keep exported ids (they appear in URLs); an id already taken by another profile's
+        # row, or by an earlier line of this batch, is skipped. The profile keeps only the
+        # children actually inserted, so its search document and summary match the tables.
+        ids = [child["id"] for profile in new for child in profile.get(field) or [] if child.get("id") is not None]
+        taken = set()
+        for start in range(0, len(ids), ID_LOOKUP_CHUNK):
+            chunk = ids[start:start + ID_LOOKUP_CHUNK]
+            taken.update((await db.execute(select(table.c.id).where(table.c.id.in_(chunk)))).scalars())
+        children = []
+        for profile in new:
+            kept = []
+            for child in profile.get(field) or []:
+                if child.get("id") is not None:
+                    if child["id"] in taken:
+                        skipped_children += 1
+                        continue
+                    taken.add(child["id"])
+                kept.append(child)
+                children.append(_parse_datetimes(
+                    {"profile_id": profile["id"], **{key: child.get(key) for key in child_keys}}, CHILD_DATETIMES[field]
+                ))
+            profile[field] = kept
+        if children:
+            await db.execute(table.insert(), children)
+            rows += len(children)
+
+    # Derived rows the write path would have built; snapshots are built on first read
+    await db.execute(UPSERT_SQL, [search_document(profile) for profile in new])
+    await db.execute(ProfileSummary.__table__.insert(), [summary_row(profile) for profile in new])
+    return len(new), len(profiles) - len(new), rows, skipped_children
+
+
+async def import_profiles(
+    db: AsyncSession,
+    lines: Iterable[bytes],
+    batch_size: int = TRANSFER_BATCH_SIZE,
+    on_batch: Optional[Callable[[ImportStats], None]] = None
+) -> ImportStats:
+    """Insert profiles from `export_profiles` NDJSON, committing every `batch_size` profiles.
+
+    Profiles whose id already exists are skipped along with their children, so a partly
+    finished import can simply be re-run. Children whose id belongs to another profile's
+    row are skipped too and counted in `skipped_children`. `on_batch(stats)` is called
+    after each commit.
+    """
+    imported = skipped = rows = skipped_children = 0
+    batch = []
+
+    async def flush():
+        nonlocal imported, skipped, rows, skipped_children
+        added, existed, inserted, collided = await _import_batch(db, batch)
+        await db.commit()
+        imported, skipped, rows = imported + added, skipped + existed, rows + inserted
+        skipped_children += collided
+        batch.clear()
+        if on_batch is not None:
+            on_batch(ImportStats(imported, skipped, rows, skipped_children))
+
+    for line in lines:
+        if not line.strip():
+            continue
+        batch.append(orjson.loads(line))
+        if len(batch) >= batch_size:
+            await flush()
+    if batch:
+        await flush()
+    return ImportStats(imported, skipped, rows, skipped_children)